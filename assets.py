@@ -0,0 +1,175 @@
+import ast
+import hashlib
+import os
+import re
+import urllib.request
+from pathlib import Path
+
+import plotly
+from fastapi.responses import FileResponse, Response
+
+
+VENDOR_DIR = Path(__file__).parent / "static" / "vendor"
+
+ASSETS_PREFIX = "/assets"
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+TAILWIND_VERSION = "1.9.6"
+
+# name -> (local file, where `python assets.py` fetches it from)
+# plotly.js ships inside the plotly package, pinned to the plotly.py release
+# that serializes our figures. Tailwind is committed under static/vendor/,
+# purged to the classes the pages use; rerun `python assets.py` after using
+# a class that is not in it yet (tests/test_assets.py checks).
+ASSETS = {
+    "plotly.min.js": (
+        Path(plotly.__file__).parent / "package_data" / "plotly.min.js", None),
+    "tailwind.min.css": (
+        VENDOR_DIR / "tailwind.min.css",
+        f"https://unpkg.com/tailwindcss@{TAILWIND_VERSION}/dist/tailwind.min.css"),
+}
+
+MEDIA_TYPES = {".js": "application/javascript", ".css": "text/css"}
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def hashed_name(name, digest):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{digest}{ext}"
+
+
+class AssetRegistry:
+    def __init__(self, assets=ASSETS):
+        self.urls = {}
+        self.files = {}
+        for name, (path, source_url) in assets.items():
+            if not path.exists():
+                # never fall back to the CDN, it may be unreachable
+                raise FileNotFoundError(
+                    f"{path} is missing, run `python assets.py` to vendor {name}")
+            served_name = hashed_name(name, file_digest(path))
+            self.files[served_name] = path
+            self.urls[name] = f"{ASSETS_PREFIX}/{served_name}"
+
+    def url(self, name):
+        return self.urls[name]
+
+    def mount(self, app):
+        # has to run before reactpy's configure(), whose catch-all index
+        # route would otherwise shadow these URLs
+        @app.get(ASSETS_PREFIX + "/{served_name}", include_in_schema=False)
+        def serve_asset(served_name):
+            path = self.files.get(served_name)
+            if path is None:
+                return Response(status_code=404)
+            return FileResponse(path, media_type=MEDIA_TYPES.get(path.suffix),
+                                headers={"Cache-Control": IMMUTABLE_CACHE})
+
+
+# ----------------------------------------------------------------
+# Tailwind purging, keeping the preflight styles and the rules of the
+# classes the pages use, like Tailwind's own production builds
+PAGES_SOURCE = Path(__file__).parent / "main.py"
+
+CLASS_SELECTOR = re.compile(r"\.((?:\\.|[^\s\\:.,>+~\[\]()#])+)")
+
+PURGE_COMMENT = "/* purged by assets.py, classes: {} */"
+
+
+def used_classes(source=PAGES_SOURCE):
+    # every token of the string literals given as a "class"/"className"
+    # attribute, className= argument or assigned to a *_class variable
+    def strings(node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            yield node.value
+        elif isinstance(node, (ast.JoinedStr, ast.BinOp, ast.IfExp)):
+            for child in ast.iter_child_nodes(node):
+                yield from strings(child)
+
+    values = []
+    for node in ast.walk(ast.parse(Path(source).read_text(encoding="utf-8"))):
+        if isinstance(node, ast.Dict):
+            values += [value for key, value in zip(node.keys, node.values)
+                       if isinstance(key, ast.Constant) and key.value in ("class", "className")]
+        elif isinstance(node, ast.keyword) and node.arg == "className":
+            values.append(node.value)
+        elif isinstance(node, ast.Assign) and any(
+                isinstance(target, ast.Name) and target.id.endswith("_class")
+                for target in node.targets):
+            values.append(node.value)
+    return sorted({name for value in values for string in strings(value)
+                   for name in string.split()})
+
+
+def css_rules(css):
+    # (prelude, body) of each top-level rule or comment of minified CSS;
+    # at-rules keep their nested rules as the body
+    rules, start, depth = [], 0, 0
+    for match in re.finditer(r"/\*.*?\*/|[{}]", css, re.S):
+        token = match.group()
+        if token.startswith("/*"):
+            if depth == 0:
+                rules.append((token, None))
+                start = match.end()
+        elif token == "{":
+            if depth == 0:
+                prelude, body_start = css[start:match.start()].strip(), match.end()
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                rules.append((prelude, css[body_start:match.start()]))
+                start = match.end()
+    return rules
+
+
+def purge(css, classes):
+    """Drop the rules of ``css`` whose selectors use classes not in ``classes``."""
+    classes = set(classes)
+    kept = []
+    for prelude, body in css_rules(css):
+        if body is None:
+            kept.append(prelude)
+        elif prelude.startswith("@media"):
+            inner = purge(body, classes)
+            if inner:
+                kept.append(f"{prelude}{{{inner}}}")
+        elif {re.sub(r"\\(.)", r"\1", name)
+              for name in CLASS_SELECTOR.findall(prelude)} <= classes:
+            kept.append(f"{prelude}{{{body}}}")
+    return "".join(kept)
+
+
+def vendored_classes(path=ASSETS["tailwind.min.css"][0]):
+    # the classes the committed Tailwind file was purged for
+    prefix, suffix = PURGE_COMMENT.split("{}")
+    css = path.read_text(encoding="utf-8")
+    if not css.startswith(prefix):
+        return []
+    return css[len(prefix):css.index(suffix)].split()
+
+
+def vendor_assets():
+    for name, (path, source_url) in ASSETS.items():
+        if source_url is None:
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        print(f"Fetching {source_url}")
+        with urllib.request.urlopen(source_url) as response:
+            css = response.read().decode("utf-8")
+        classes = used_classes()
+        path.write_text(PURGE_COMMENT.format(" ".join(classes)) + purge(css, classes),
+                        encoding="utf-8")
+        print(f"Saved {path} ({file_digest(path)})")
+
+
+if __name__ == "__main__":
+    vendor_assets()
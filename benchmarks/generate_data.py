@@ -0,0 +1,216 @@
+"""Synthetic Sample_Store datasets of any size, for benchmarking.
+
+Every distribution is fitted from the shipped ``Sample_Store.csv``: lines per
+order, orders per customer, customer segments, (City, State, Region), ship
+modes and shipping delays, order seasonality and yearly growth, the per-state
+discount mix, and products with their prices and margins at each discount.
+
+    python benchmarks/generate_data.py 1000000
+    python benchmarks/generate_data.py 50000000 -o benchmarks/data/store_50m.csv
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED_PATH = os.path.join(ROOT, "Sample_Store.csv")
+DATA_DIR = os.path.join(ROOT, "benchmarks", "data")
+
+COLUMNS = ["Order_ID", "Order_Date", "Ship_Date", "Ship_Mode", "Customer_ID",
+           "Customer_Name", "Segment", "Country", "City", "State", "Region",
+           "Category", "Sub_Category", "Sales", "Quantity", "Discount", "Profit"]
+
+CHUNK_ROWS = 1_000_000
+
+
+def distribution(series):
+    counts = series.value_counts(sort=False)
+    return counts.index.to_numpy(), (counts / counts.sum()).to_numpy()
+
+
+class StoreModel:
+    """Empirical distributions of the seed dataset."""
+
+    def __init__(self, seed_path=SEED_PATH):
+        seed = pd.read_csv(seed_path, encoding="unicode_escape")
+        order_date = pd.to_datetime(seed["Order_Date"], format="%m/%d/%Y")
+        ship_date = pd.to_datetime(seed["Ship_Date"], format="%m/%d/%Y")
+        orders = seed.assign(Year=order_date.dt.year, Month=order_date.dt.month,
+                             Days=(ship_date - order_date).dt.days)
+        orders = orders.drop_duplicates("Order_ID")
+
+        self.rows_per_customer = len(seed) / seed["Customer_ID"].nunique()
+        self.lines_per_order = distribution(seed.groupby("Order_ID").size())
+        self.segments = distribution(
+            seed.drop_duplicates("Customer_ID")["Segment"])
+        names = seed["Customer_Name"].drop_duplicates().str.split()
+        self.first_names = names.str[0].unique()
+        self.last_names = names.str[-1].unique()
+
+        locations = orders.groupby(["City", "State", "Region"]).size()
+        self.locations = locations.index.to_frame(index=False)
+        self.location_p = (locations / locations.sum()).to_numpy()
+
+        self.ship_modes = distribution(orders["Ship_Mode"])
+        self.ship_days = {mode: distribution(days)
+                          for mode, days in orders.groupby("Ship_Mode")["Days"]}
+        self.order_prefixes = distribution(orders["Order_ID"].str[:2])
+
+        years = orders["Year"].value_counts().sort_index()
+        self.first_year, self.last_year = years.index.min(), years.index.max()
+        self.growth = (years.iloc[-1] / years.iloc[0]) ** (1 / max(1, len(years) - 1))
+        self.months = distribution(orders["Month"])
+
+        # discounts are set per state, and margins follow the discount
+        self.state_discounts = {state: distribution(discounts)
+                                for state, discounts in seed.groupby("State")["Discount"]}
+        self.quantities = distribution(seed["Quantity"])
+        lines = seed.assign(Unit=seed["Sales"] / seed["Quantity"],
+                            Margin=seed["Profit"] / seed["Sales"])
+        self.products = {discount: group[["Category", "Sub_Category", "Unit", "Margin"]]
+                         .reset_index(drop=True)
+                         for discount, group in lines.groupby("Discount")}
+
+
+def choice(rng, values_p, size):
+    values, p = values_p
+    return values[rng.choice(len(values), size=size, p=p)]
+
+
+def make_customers(model, rng, count):
+    first = model.first_names[rng.integers(len(model.first_names), size=count)]
+    last = model.last_names[rng.integers(len(model.last_names), size=count)]
+    initials = pd.Series(first).str[0] + pd.Series(last).str[0]
+    number = pd.Series(np.arange(10000, 10000 + count)).astype(str)
+    return pd.DataFrame({
+        "Customer_ID": (initials + "-" + number).to_numpy(),
+        "Customer_Name": (pd.Series(first) + " " + pd.Series(last)).to_numpy(),
+        "Segment": choice(rng, model.segments, count),
+    })
+
+
+def date_strings(days):
+    # m/d/Y without zero padding, like the seed; formatted once per distinct day
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    dates = pd.to_datetime(unique_days, unit="D")
+    labels = (dates.month.astype(str) + "/" + dates.day.astype(str) + "/"
+              + dates.year.astype(str)).to_numpy()
+    return labels[inverse]
+
+
+def make_orders(model, rng, customers, count, first_order, years):
+    year_p = model.growth ** np.arange(len(years))
+    year = rng.choice(years, size=count, p=year_p / year_p.sum())
+    month = choice(rng, model.months, count)
+    month_start = pd.to_datetime(pd.DataFrame({"year": year, "month": month, "day": 1}))
+    order_day = ((month_start - pd.Timestamp(0)).dt.days.to_numpy()
+                 + (rng.random(count) * month_start.dt.days_in_month.to_numpy()).astype(int))
+
+    ship_mode = choice(rng, model.ship_modes, count)
+    ship_day = order_day.copy()
+    for mode, days_p in model.ship_days.items():
+        rows = np.flatnonzero(ship_mode == mode)
+        ship_day[rows] += choice(rng, days_p, len(rows))
+
+    number = np.arange(first_order, first_order + count).astype(str)
+    order_id = (pd.Series(choice(rng, model.order_prefixes, count)) + "-"
+                + pd.Series(year).astype(str) + "-" + pd.Series(number))
+
+    location = rng.choice(len(model.locations), size=count, p=model.location_p)
+    customer = rng.integers(len(customers), size=count)
+    orders = pd.DataFrame({"Order_ID": order_id.to_numpy(),
+                           "Order_Date": date_strings(order_day),
+                           "Ship_Date": date_strings(ship_day),
+                           "Ship_Mode": ship_mode})
+    orders = pd.concat([orders, customers.iloc[customer].reset_index(drop=True)], axis=1)
+    orders["Country"] = "United States"
+    return pd.concat([orders, model.locations.iloc[location].reset_index(drop=True)], axis=1)
+
+
+def make_lines(model, rng, orders, lines_per_order):
+    lines = orders.loc[orders.index.repeat(lines_per_order)].reset_index(drop=True)
+    count = len(lines)
+
+    discount = np.zeros(count)
+    for state, rows in lines.groupby("State", sort=False).indices.items():
+        discount[rows] = choice(rng, model.state_discounts[state], len(rows))
+
+    unit = np.empty(count)
+    margin = np.empty(count)
+    category = np.empty(count, dtype=object)
+    sub_category = np.empty(count, dtype=object)
+    for value, products in model.products.items():
+        rows = np.flatnonzero(discount == value)
+        picked = products.iloc[rng.integers(len(products), size=len(rows))]
+        category[rows] = picked["Category"].to_numpy()
+        sub_category[rows] = picked["Sub_Category"].to_numpy()
+        unit[rows] = picked["Unit"].to_numpy()
+        margin[rows] = picked["Margin"].to_numpy()
+
+    quantity = choice(rng, model.quantities, count)
+    sales = unit * quantity * rng.lognormal(0.0, 0.1, count)
+    profit = sales * margin * rng.lognormal(0.0, 0.1, count)
+
+    lines["Category"] = category
+    lines["Sub_Category"] = sub_category
+    lines["Sales"] = sales.round(4)
+    lines["Quantity"] = quantity
+    lines["Discount"] = discount
+    lines["Profit"] = profit.round(4)
+    return lines[COLUMNS]
+
+
+def generate(rows, path, seed=0, first_year=None, last_year=None, model=None):
+    model = model or StoreModel()
+    rng = np.random.default_rng(seed)
+    years = np.arange(first_year or model.first_year, (last_year or model.last_year) + 1)
+    customers = make_customers(
+        model, rng, max(1, round(rows / model.rows_per_customer)))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    written, next_order = 0, 100000
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        while written < rows:
+            wanted = min(CHUNK_ROWS, rows - written)
+            # enough orders for the wanted lines, then trim the last order
+            lines_per_order = choice(rng, model.lines_per_order, wanted)
+            lines_per_order = lines_per_order[np.cumsum(lines_per_order) - lines_per_order < wanted]
+            lines_per_order[-1] -= lines_per_order.sum() - wanted
+
+            orders = make_orders(model, rng, customers, len(lines_per_order),
+                                 next_order, years)
+            make_lines(model, rng, orders, lines_per_order).to_csv(
+                f, header=written == 0, index=False)
+            written += wanted
+            next_order += len(lines_per_order)
+    os.replace(tmp_path, path)
+    return path
+
+
+def default_path(rows):
+    return os.path.join(DATA_DIR, f"sample_store_{rows}.csv")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rows", type=int, help="number of order lines, e.g. 10000 to 50000000")
+    parser.add_argument("-o", "--output", help="CSV path (default benchmarks/data/sample_store_<rows>.csv)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--first-year", type=int)
+    parser.add_argument("--last-year", type=int)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    path = generate(args.rows, args.output or default_path(args.rows), seed=args.seed,
+                    first_year=args.first_year, last_year=args.last_year)
+    print(f"Wrote {args.rows:,} rows to {path} in {time.perf_counter() - started:.1f}s",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Concurrent-session load test of the dashboard over ReactPy websockets.
+
+Starts the app in a uvicorn subprocess (one worker), then for each
+concurrency level opens that many websocket sessions. Each session behaves
+like a browser tab: it clicks the sidebar links between the five pages and
+submits random filter forms, with some think time in between. An action's
+latency runs from sending the event until the page stops showing "Loading...".
+
+Per level it reports p50/p95/p99 latency, completed actions per second and
+the server's resident memory, and writes everything as JSON to
+benchmarks/results/. Everything runs locally; no external service is used.
+
+    python benchmarks/load_test.py --levels 1 10 50 --duration 30
+    DASHBOARD_COMPUTE=thread python benchmarks/load_test.py --levels 25
+
+The client is a single Python process too; at high levels check that it is
+not the bottleneck (compare with the server's CPU).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import websockets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+PAGES = ["/", "/locations", "/customers", "/TimeSeries", "/Logistics"]
+STREAM_PATH = "/_reactpy/stream"
+LOADING = "Loading..."
+
+
+# ----------------------------------------------------------------
+# The dashboard as a browser would see it
+
+def apply_update(model, path, update):
+    # layout-update paths look like "/children/0/children/2"; "" is the root
+    if not path:
+        return update
+    parts = path.strip("/").split("/")
+    node = model
+    for part in parts[:-1]:
+        node = node[int(part)] if isinstance(node, list) else node[part]
+    last = parts[-1]
+    if isinstance(node, list):
+        node[int(last)] = update
+    else:
+        node[last] = update
+    return model
+
+
+def walk(node):
+    if isinstance(node, dict):
+        yield node
+        for child in node.get("children", ()):
+            yield from walk(child)
+
+
+def is_loading(model):
+    return any(LOADING in node.get("children", ()) for node in walk(model))
+
+
+class RenderError(Exception):
+    pass
+
+
+def handler(node, name):
+    # the dashboard declares handlers in snake_case ("on_submit")
+    handlers = node.get("eventHandlers", {})
+    spec = handlers.get(name) or handlers.get("on_" + name[2:].lower()) or {}
+    return spec.get("target")
+
+
+class Session:
+    """One dashboard tab: a websocket and the VDOM it has been sent."""
+
+    def __init__(self, url, rng, timeout):
+        self.url = url
+        self.rng = rng
+        self.timeout = timeout
+        self.model = {}
+        self.socket = None
+        self.path = None
+
+    async def open(self, path):
+        started = time.perf_counter()
+        self.path = path
+        self.socket = await websockets.connect(
+            self.url + STREAM_PATH + path, max_size=None, open_timeout=self.timeout)
+        await self.settle()
+        return time.perf_counter() - started
+
+    async def close(self):
+        if self.socket is not None:
+            await self.socket.close()
+            self.socket = None
+
+    async def receive(self, timeout):
+        message = json.loads(await asyncio.wait_for(self.socket.recv(), timeout))
+        if message.get("type") == "layout-update":
+            self.model = apply_update(self.model, message["path"], message["model"])
+
+    async def drain(self, wait=0.01):
+        # updates that arrived after the last action settled (a zero timeout
+        # would give up before even reading a buffered message)
+        while True:
+            try:
+                await self.receive(wait)
+            except asyncio.TimeoutError:
+                return
+
+    async def settle(self):
+        deadline = time.perf_counter() + self.timeout
+        await self.receive(self.timeout)
+        while is_loading(self.model):
+            await self.receive(max(0.0, deadline - time.perf_counter()))
+        # ReactPy replaces a component that raised while rendering by an
+        # {"error": ...} node
+        if any("error" in node for node in walk(self.model)):
+            raise RenderError(f"{self.path} failed to render")
+
+    async def send(self, target, event):
+        await self.socket.send(json.dumps(
+            {"type": "layout-event", "target": target, "data": [event]}))
+
+    async def navigate(self, path):
+        link = next(node for node in walk(self.model)
+                    if node.get("attributes", {}).get("to") == path and handler(node, "onClick"))
+        started = time.perf_counter()
+        await self.send(handler(link, "onClick"), {"pathname": path, "search": ""})
+        await self.settle()
+        self.path = path
+        return time.perf_counter() - started
+
+    def options(self, select_id):
+        select = next(node for node in walk(self.model)
+                      if node.get("attributes", {}).get("id") == select_id)
+        return [option["attributes"]["value"] for option in select.get("children", ())
+                if isinstance(option, dict)]
+
+    async def filter(self):
+        values = [self.rng.choice(self.options(select_id))
+                  for select_id in ("states-select", "years-select", "category-select")]
+        form = next(node for node in walk(self.model)
+                    if node.get("tagName") == "form" and handler(node, "onSubmit"))
+        started = time.perf_counter()
+        await self.send(handler(form, "onSubmit"),
+                        {"target": {"elements": [{"value": value} for value in values]}})
+        await self.settle()
+        return time.perf_counter() - started
+
+
+async def run_session(url, rng, deadline, think, timeout, samples, errors):
+    the_session = Session(url, rng, timeout)
+    try:
+        while time.perf_counter() < deadline:
+            try:
+                if the_session.socket is None:
+                    samples.append(("open", await the_session.open(rng.choice(PAGES))))
+                await asyncio.sleep(rng.expovariate(1 / think) if think else 0)
+                await the_session.drain()
+                if rng.random() < 0.4:
+                    path = rng.choice([page for page in PAGES if page != the_session.path])
+                    samples.append(("navigate", await the_session.navigate(path)))
+                else:
+                    samples.append(("filter", await the_session.filter()))
+            except Exception as error:
+                # a timeout, a dropped socket or a page that failed to render:
+                # count it and reload like a user would
+                errors.append(repr(error))
+                await the_session.close()
+                the_session = Session(url, rng, timeout)
+    finally:
+        await the_session.close()
+
+
+# ----------------------------------------------------------------
+# Server under test
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, timeout=120):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            # 503 until the dataset is loaded
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_dashboard/ready", timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError(f"Server did not start within {timeout}s")
+
+
+def rss_bytes(pid):
+    # Linux only; None elsewhere
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+
+
+async def sample_rss(pid, peak, interval=0.2):
+    while True:
+        rss = rss_bytes(pid)
+        if rss is not None:
+            peak[0] = max(peak[0], rss)
+        await asyncio.sleep(interval)
+
+
+# ----------------------------------------------------------------
+# Report
+
+def percentile(values, q):
+    # nearest-rank percentile
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))
+    return round(ordered[rank], 4)
+
+
+def latency_summary(values):
+    return {"count": len(values), "p50": percentile(values, 50),
+            "p95": percentile(values, 95), "p99": percentile(values, 99),
+            "max": round(max(values), 4) if values else None}
+
+
+async def run_level(url, sessions, duration, think, timeout, seed, pid):
+    samples, errors, peak = [], [], [0]
+    sampler = asyncio.create_task(sample_rss(pid, peak)) if pid else None
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        run_session(url, random.Random(seed * 100003 + number), deadline, think,
+                    timeout, samples, errors)
+        for number in range(sessions)))
+    elapsed = time.perf_counter() - started
+    if sampler is not None:
+        sampler.cancel()
+
+    actions = [seconds for kind, seconds in samples if kind != "open"]
+    return {
+        "sessions": sessions,
+        "elapsed": round(elapsed, 2),
+        "actions": len(actions),
+        "throughput": round(len(actions) / elapsed, 2),
+        "errors": len(errors),
+        "error_samples": errors[:5],
+        "latency": latency_summary(actions),
+        "by_kind": {kind: latency_summary([seconds for name, seconds in samples if name == kind])
+                    for kind in ("open", "navigate", "filter")},
+        "server_rss_peak_bytes": peak[0] or None,
+        "server_rss_end_bytes": rss_bytes(pid) if pid else None,
+    }
+
+
+def print_level(result):
+    latency = result["latency"]
+    rss = result["server_rss_peak_bytes"]
+    print(f"{result['sessions']:>8} {result['actions']:>8} {result['throughput']:>8.2f}/s "
+          f"{latency['p50'] or 0:>8.3f} {latency['p95'] or 0:>8.3f} {latency['p99'] or 0:>8.3f} "
+          f"{(rss or 0) / 2**20:>9.1f} {result['errors']:>7}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 5, 10, 25],
+                        help="concurrent sessions per level")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per level")
+    parser.add_argument("--think", type=float, default=0.5,
+                        help="mean think time between a session's actions, in seconds")
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="seconds an action may take before the session counts an error")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="test a running server instead, e.g. ws://127.0.0.1:8000")
+    parser.add_argument("--pid", type=int, help="process id of --url's server, for memory")
+    parser.add_argument("--output", help="results file (default benchmarks/results/load-<time>.json)")
+    args = parser.parse_args(argv)
+
+    server = None
+    url, pid = args.url, args.pid
+    if url is None:
+        port = free_port()
+        server = start_server(port)
+        url, pid = f"ws://127.0.0.1:{port}", server.pid
+    url = url.rstrip("/")
+
+    results = {"meta": {"levels": args.levels, "duration": args.duration, "think": args.think,
+                        "compute": os.environ.get("DASHBOARD_COMPUTE", "inline"),
+                        "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+               "levels": []}
+    print(f"{'sessions':>8} {'actions':>8} {'throughput':>10} {'p50':>8} {'p95':>8} "
+          f"{'p99':>8} {'rss MiB':>9} {'errors':>7}")
+    try:
+        for level in args.levels:
+            result = asyncio.run(run_level(url, level, args.duration, args.think,
+                                           args.timeout, args.seed, pid))
+            results["levels"].append(result)
+            print_level(result)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, time.strftime("load-%Y%m%d-%H%M%S.json"))
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
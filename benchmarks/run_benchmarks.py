@@ -0,0 +1,242 @@
+"""Times data load, filtering and every dashboard page across dataset sizes.
+
+Each size runs in a fresh interpreter that imports ``main`` against a
+generated dataset (see generate_data.py). Results are written as JSON to
+benchmarks/results/, and ``--compare`` diffs two result files so regressions
+show up between commits.
+
+    python benchmarks/run_benchmarks.py --sizes sample 100000 1000000
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import generate_data
+
+ROOT = generate_data.ROOT
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def timed(function, repeat):
+    # median wall time of ``repeat`` calls, plus the last result
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - started)
+    return round(statistics.median(seconds), 6), result
+
+
+def filter_combinations(main):
+    # broad to narrow: nothing, each single filter, then all three together
+    cells = main.cube.cells
+    state = cells.groupby("State", observed=True)["Rows"].sum().idxmax()
+    category = cells.groupby("Category", observed=True)["Rows"].sum().idxmax()
+    year = str(max(main.years_list[1:]))
+    return {
+        "all": ("All", "All", "All"),
+        "state": (state, "All", "All"),
+        "year": ("All", year, "All"),
+        "category": ("All", "All", category),
+        "state+year+category": (state, year, category),
+    }
+
+
+def measure(data_path, repeat):
+    """Runs inside the worker interpreter, after DASHBOARD_DATA_PATH is set."""
+    import resource
+
+    started = time.perf_counter()
+    import main
+    import_seconds = time.perf_counter() - started
+    # what the app lifespan does in the background
+    started = time.perf_counter()
+    main.load_dataset()
+    dataset_seconds = time.perf_counter() - started
+
+    from filter_index import filter_form, filter_key
+    from snapshot import load_snapshot
+
+    result = {
+        "rows": len(main.row_store),
+        "csv_bytes": os.path.getsize(data_path),
+        "memory_bytes": sum(partition["bytes"] for partition in main.row_store.partitions),
+        "load": {
+            "import": round(import_seconds, 6),
+            "dataset": round(dataset_seconds, 6),
+            "startup": main.startup.report()["phases"],
+            "source": main.dataset_info["source"],
+            "csv": timed(lambda: main.read_sample_store(data_path), repeat)[0],
+            # opening the snapshot is lazy, time reading every partition
+            "snapshot": timed(lambda: list(load_snapshot(
+                data_path, main.read_sample_store, version=main.SNAPSHOT_VERSION,
+                partition_by=main.PARTITION_BY)[0].frames()), repeat)[0],
+        },
+        "filter": {},
+        "pages": {},
+    }
+
+    combinations = filter_combinations(main)
+    for name, the_key in combinations.items():
+        the_form = filter_form(the_key)
+        result["filter"][name] = timed(lambda: main.row_store.rows(the_form), repeat)[0]
+
+    scheduler = main.page_scheduler
+    for page in scheduler.pages:
+        result["pages"][page] = {}
+        for name, the_key in combinations.items():
+            the_key = filter_key(filter_form(the_key))
+
+            def cold():
+                main.aggregation_cache.clear()
+                main.figure_cache.clear()
+                return scheduler.run_sync(page, the_key)
+
+            try:
+                cold_seconds, _ = timed(cold, repeat)
+                tasks = scheduler.reports[page]["tasks"]
+                warm_seconds, _ = timed(lambda: scheduler.run_sync(page, the_key), repeat)
+            except Exception as error:
+                # e.g. a filter combination without rows in a small dataset
+                result["pages"][page][name] = {"error": repr(error)}
+                continue
+            result["pages"][page][name] = {
+                "cold": cold_seconds, "warm": warm_seconds, "tasks": tasks}
+
+    result["peak_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return result
+
+
+def run_worker(data_path, repeat):
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        out_path = f.name
+    try:
+        env = dict(os.environ, DASHBOARD_DATA_PATH=os.path.abspath(data_path),
+                   DASHBOARD_COMPUTE="inline", DASHBOARD_WARMUP="0")
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", data_path,
+                        "--repeat", str(repeat), "--output", out_path],
+                       cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+        with open(out_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.remove(out_path)
+
+
+def dataset_path(size, seed):
+    if size == "sample":
+        return os.path.join(ROOT, "Sample_Store.csv")
+    path = generate_data.default_path(int(size))
+    if not os.path.exists(path):
+        print(f"Generating {int(size):,} rows", file=sys.stderr)
+        generate_data.generate(int(size), path, seed=seed)
+    return path
+
+
+def git_revision():
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True,
+                              text=True).stdout.strip()
+    return {"commit": git("rev-parse", "HEAD") or None,
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def environment():
+    import numpy
+    import pandas
+    return {"python": platform.python_version(), "pandas": pandas.__version__,
+            "numpy": numpy.__version__, "platform": platform.platform(),
+            "cpu_count": os.cpu_count()}
+
+
+def run(sizes, repeat, seed):
+    results = {"meta": dict(git_revision(), **environment(), repeat=repeat,
+                            created=time.strftime("%Y-%m-%dT%H:%M:%S")),
+               "sizes": {}}
+    for size in sizes:
+        path = dataset_path(size, seed)
+        print(f"Benchmarking {path}", file=sys.stderr)
+        result = run_worker(path, repeat)
+        results["sizes"][str(size)] = result
+        print(f"  {result['rows']:,} rows: CSV load {result['load']['csv']:.2f}s, "
+              f"snapshot load {result['load']['snapshot']:.2f}s", file=sys.stderr)
+    return results
+
+
+def flatten(value, prefix=""):
+    # {"a": {"b": 1.0}} -> {"a.b": 1.0}, keeping timings only
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(flatten(item, f"{prefix}.{key}" if prefix else key))
+        return flat
+    if isinstance(value, float):
+        return {prefix: value}
+    return {}
+
+
+def compare(old_path, new_path, threshold):
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = flatten(json.load(f)["sizes"])
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = flatten(json.load(f)["sizes"])
+
+    regressions = 0
+    for name in sorted(old.keys() & new.keys()):
+        # sub-millisecond timings (cache hits) are mostly noise
+        if max(old[name], new[name]) < 0.001:
+            continue
+        ratio = new[name] / old[name]
+        flag = ""
+        if ratio >= threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio <= 1 / threshold:
+            flag = "  faster"
+        print(f"{name:70} {old[name]:10.4f} {new[name]:10.4f} {ratio:6.2f}x{flag}")
+    print(f"{regressions} regression(s) over {threshold}x")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["sample", "100000", "1000000"],
+                        help='row counts to benchmark, "sample" is the shipped CSV')
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="results file (default benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio reported as a regression by --compare")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    if args.worker:
+        sys.path.insert(0, ROOT)
+        result = measure(args.worker, args.repeat)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    results = run(args.sizes, args.repeat, args.seed)
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        commit = (results["meta"]["commit"] or "nogit")[:10]
+        output = os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S-") + commit + ".json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
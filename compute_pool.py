@@ -0,0 +1,135 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from reactpy import use_effect, use_state
+
+
+COMPUTE_MODES = ("inline", "thread", "process")
+
+
+class ComputeTimeout(Exception):
+    pass
+
+
+class ComputePool:
+    """Runs data and figure computation inline or in a worker pool.
+
+    ``inline`` keeps the old behaviour and computes inside the render.
+    ``thread`` and ``process`` dispatch to a pool so the event loop keeps
+    serving other sessions; functions must then be module-level so they can
+    be sent to a process.
+    """
+
+    def __init__(self, mode="inline", workers=None, timeout=30.0, initializer=None):
+        if mode not in COMPUTE_MODES:
+            raise ValueError(
+                f"Unknown compute mode {mode!r}, expected one of {COMPUTE_MODES}")
+        self.mode = mode
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+        # run by each process worker as it starts, e.g. to load the dataset
+        self.initializer = initializer
+        self._executor = None
+        # superseded work: dropped before it started / finished but unused
+        self.cancelled = 0
+        self.discarded = 0
+        # inline computations in progress
+        self.running = 0
+        self._running_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, initializer=None):
+        timeout = os.environ.get("DASHBOARD_COMPUTE_TIMEOUT")
+        workers = os.environ.get("DASHBOARD_COMPUTE_WORKERS")
+        return cls(mode=os.environ.get("DASHBOARD_COMPUTE", "inline"),
+                   workers=int(workers) if workers else None,
+                   timeout=float(timeout) if timeout else 30.0,
+                   initializer=initializer)
+
+    @property
+    def inline(self):
+        return self.mode == "inline"
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=self.initializer)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="dashboard-compute")
+        return self._executor
+
+    @property
+    def busy(self):
+        return self.running > 0
+
+    def run_sync(self, function, *args):
+        with self._running_lock:
+            self.running += 1
+        try:
+            return function(*args)
+        finally:
+            with self._running_lock:
+                self.running -= 1
+
+    async def run(self, function, *args):
+        if self.inline:
+            return self.run_sync(function, *args)
+        future = self.executor.submit(function, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise ComputeTimeout(
+                f"{function.__name__}{args} took longer than {self.timeout}s") from None
+        except asyncio.CancelledError:
+            # a running worker can't be interrupted, its result is thrown away
+            if future.cancel():
+                self.cancelled += 1
+            else:
+                self.discarded += 1
+            raise
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        return {"mode": self.mode, "workers": self.workers,
+                "cancelled": self.cancelled, "discarded": self.discarded}
+
+
+PENDING = object()
+
+
+def use_computation(pool, function, *args):
+    """Hook returning ``function(*args)``, computed through ``pool``.
+
+    ``pool`` is a ComputePool or anything with the same ``inline``,
+    ``run_sync`` and async ``run`` (see PageScheduler). Returns ``PENDING``
+    until the result arrives, and the exception instance (``ComputeTimeout``
+    if it timed out) if the computation failed. Arguments must keep their identity between renders (see
+    ``filter_key``), they are the effect dependencies.
+    """
+    if pool.inline:
+        return pool.run_sync(function, *args)
+
+    result, set_result = use_state((None, PENDING))
+
+    @use_effect(dependencies=[function, *args])
+    async def compute():
+        try:
+            value = await pool.run(function, *args)
+        except Exception as error:
+            # rendered by the page, instead of loading forever
+            value = error
+        set_result((args, value))
+
+    result_args, value = result
+    if result_args != args:
+        return PENDING
+    return value
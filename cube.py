@@ -0,0 +1,45 @@
+import pandas as pd
+
+from filter_index import FilterIndex
+
+
+CUBE_DIMENSIONS = ["State", "Category", "Order_Year", "Order_Month",
+                   "Region", "Segment", "Ship_Mode", "Sub_Category"]
+
+CUBE_MEASURES = ["Sales", "Profit", "Quantity"]
+
+
+def build_cube(the_df):
+    grouped = the_df.groupby(CUBE_DIMENSIONS, observed=True, sort=False)
+    cells = grouped[CUBE_MEASURES].sum()
+    cells["Rows"] = grouped.size()
+    return cells.reset_index()
+
+
+class Cube:
+    """Sales, Profit, Quantity and row counts at the finest dashboard grain.
+
+    Cells keep the dimension column names of the raw frame, so a slice can be
+    handed to the chart builders in place of the filtered rows as long as they
+    only sum measures (row counts come from ``Rows``).
+
+    Built from the cells of each data partition (``piece``), which
+    ``combine`` stacks: partitions split the rows by Order_Year and Region,
+    both dimensions, so no cell spans two of them.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+        self.index = FilterIndex(self.cells)
+
+    piece = staticmethod(build_cube)
+
+    @classmethod
+    def combine(cls, pieces):
+        return cls(pd.concat(pieces, ignore_index=True))
+
+    def __len__(self):
+        return len(self.cells)
+
+    def slice(self, form_data):
+        return self.index.view(form_data)
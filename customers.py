@@ -0,0 +1,88 @@
+import pandas as pd
+
+from filter_index import FILTER_COLUMNS, FilterIndex
+
+
+CUSTOMER_MEASURES = ["Orders", "Lines", "Sales", "Profit"]
+
+
+def build_partitions(the_df, by):
+    # one row per customer and ``by`` value, with the position in the source
+    # file (the_df's index) of its first row
+    rows = the_df[["Customer_ID", "Order_ID", "Order_Date", "Sales", "Profit", *by]]
+    rows = rows.assign(First_Row=the_df.index)
+    grouped = rows.groupby(["Customer_ID", *by], observed=True, sort=False)
+    parts = grouped.agg(
+        Orders=("Order_ID", "nunique"),
+        Lines=("Order_ID", "size"),
+        Sales=("Sales", "sum"),
+        Profit=("Profit", "sum"),
+        First_Order_Date=("Order_Date", "min"),
+        First_Row=("First_Row", "min"),
+    )
+    return parts.reset_index()
+
+
+def stack_partitions(pieces):
+    # ordered by where the customer first appears
+    return pd.concat(pieces).sort_values("First_Row", kind="stable", ignore_index=True)
+
+
+class CustomerTable:
+    """Customer dimension: one row per customer with its name, segment, order
+    and line counts, Sales, Profit and first order date.
+
+    Built once per dataset version from per-customer partitions by State and
+    Order_Year (and Category). A filtered view sums the partitions the filter
+    keeps, found through a FilterIndex, instead of regrouping the raw rows.
+    An order has a single state and year but may span categories, so the
+    Category partitions are only used when that filter is set; that keeps
+    order counts exact.
+
+    Customers come out in the order they first appear in the filtered rows.
+
+    ``piece`` builds the attributes and partitions of one data partition and
+    ``combine`` stacks them; data partitions split the rows by Order_Year and
+    Region, so a customer partition never spans two of them.
+    """
+
+    def __init__(self, attributes, partitions, category_partitions):
+        self.attributes = attributes
+        self.partitions = FilterIndex(
+            partitions, columns={"state": "State", "year": "Order_Year"})
+        self.category_partitions = FilterIndex(category_partitions)
+        self.customers = self.per_customer(self.partitions.the_df)
+
+    @staticmethod
+    def piece(the_df):
+        return (the_df.drop_duplicates("Customer_ID").set_index(
+                    "Customer_ID")[["Customer_Name", "Segment"]],
+                build_partitions(the_df, ["State", "Order_Year"]),
+                build_partitions(the_df, ["State", "Order_Year", "Category"]))
+
+    @classmethod
+    def combine(cls, pieces):
+        attributes, partitions, category_partitions = zip(*pieces)
+        attributes = pd.concat(attributes)
+        return cls(attributes[~attributes.index.duplicated()],
+                   stack_partitions(partitions), stack_partitions(category_partitions))
+
+    def __len__(self):
+        return len(self.customers)
+
+    def slice(self, form_data):
+        # customer partitions the filter keeps, a customer may have several
+        if form_data.get("category", "All") == "All":
+            return self.partitions.view(form_data)
+        return self.category_partitions.view(form_data)
+
+    def view(self, form_data):
+        if all(form_data.get(key, "All") == "All" for key in FILTER_COLUMNS):
+            return self.customers
+        return self.per_customer(self.slice(form_data))
+
+    def per_customer(self, parts):
+        grouped = parts.groupby("Customer_ID", sort=False)
+        customers = grouped[CUSTOMER_MEASURES].sum()
+        customers["First_Order_Date"] = grouped["First_Order_Date"].min()
+        return self.attributes.reindex(customers.index).join(customers)
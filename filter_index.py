@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+
+# form_data key -> column it filters on
+FILTER_COLUMNS = {"state": "State", "category": "Category", "year": "Order_Year"}
+
+
+def build_positions(the_series):
+    codes, uniques = pd.factorize(the_series, sort=True)
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    order = order[len(order) - counts.sum():]  # drop missing values (code -1)
+    groups = np.split(order, np.cumsum(counts)[:-1])
+    return {str(value): rows for value, rows in zip(uniques, groups)}
+
+
+class FilterIndex:
+    """Row positions of every State, Category and Order_Year value.
+
+    Built once at load; a ``form_data`` dict resolves to the intersection of
+    the matching position arrays instead of chained boolean masks.
+
+    ``positions`` adds keys that no single column holds, as
+    {key: {value: sorted row positions}}; e.g. an order is listed under every
+    category it has lines in.
+    """
+
+    def __init__(self, the_df, columns=FILTER_COLUMNS, positions=None):
+        self.the_df = the_df
+        self.columns = columns
+        self.positions = {key: build_positions(the_df[col])
+                          for key, col in columns.items()}
+        self.positions.update(positions or {})
+
+    def select(self, form_data):
+        # None means "every row"
+        selected = []
+        for key in self.positions:
+            value = form_data.get(key, "All")
+            if value == "All":
+                continue
+            rows = self.positions[key].get(str(value))
+            if rows is None:
+                return np.empty(0, dtype=np.intp)
+            selected.append(rows)
+
+        if not selected:
+            return None
+
+        selected.sort(key=len)
+        rows = selected[0]
+        for other in selected[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def view(self, form_data):
+        rows = self.select(form_data)
+        if rows is None:
+            return self.the_df
+        if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+            # contiguous selection, a slice doesn't copy the data
+            return self.the_df.iloc[rows[0]:rows[-1] + 1]
+        return self.the_df.take(rows)
+
+
+# The (state, year, category) values of the dataset, see set_filter_values().
+# Form values come from the client, so only keys made of these are interned;
+# anything else would grow _interned_keys without bound.
+_filter_values = (set(), set(), set())
+_interned_keys = {}
+
+
+def set_filter_values(states, years, categories):
+    global _filter_values
+    _filter_values = tuple({str(value) for value in values}
+                           for values in (states, years, categories))
+    _interned_keys.clear()
+
+
+def known_filter(form_data):
+    # True when every filter value is one of the dataset's
+    return all(value in values for value, values in zip(filter_key(form_data), _filter_values))
+
+
+def filter_key(form_data):
+    # Hashable (state, year, category) tuple used as a cache key. Equal keys
+    # of known values are the same object, so ReactPy hook dependencies see
+    # them as unchanged.
+    key = (form_data.get("state", "All"), str(form_data.get("year", "All")),
+           form_data.get("category", "All"))
+    if all(value in values for value, values in zip(key, _filter_values)):
+        return _interned_keys.setdefault(key, key)
+    return key
+
+
+def filter_form(key):
+    state, year, category = key
+    return {"state": state, "year": year, "category": category}
@@ -0,0 +1,95 @@
+"""Declared KPI card metrics, evaluated with one pass per grouping key."""
+import sys
+from collections import namedtuple
+
+
+def idxmax(table, metric):
+    if metric.label is None:
+        return table[metric.column].idxmax()
+    return table[metric.label].iloc[table[metric.column].argmax()]
+
+
+# reduce -> function(table, metric) applied to the (grouped) table
+REDUCERS = {
+    "sum": lambda table, metric: table[metric.column].sum(),
+    "mean": lambda table, metric: table[metric.column].mean(),
+    "nunique": lambda table, metric: table[metric.column].nunique(),
+    "count": lambda table, metric: len(table),
+    "idxmax": idxmax,
+}
+
+
+class Metric:
+    """One KPI card value.
+
+    Without ``per`` it reduces a column of the filtered rows, e.g. the total
+    Sales or the number of distinct customers. With ``per`` the rows are
+    first grouped by that key, taking ``inner`` (e.g. "sum") of the column
+    per group, and ``reduce`` then runs over the groups, e.g. the state with
+    the most cube rows.
+
+    ``cells`` metrics only sum measures, so they read the (much smaller) cube
+    slice when one is given. ``label`` makes "idxmax" return that column of
+    the maximum row rather than its index, e.g. the name of the customer with
+    the most orders.
+    """
+
+    def __init__(self, name, column, reduce, per=None, inner="sum", cells=False,
+                 label=None):
+        if reduce not in REDUCERS:
+            raise ValueError(f"Unknown reduce {reduce!r}, expected one of {tuple(REDUCERS)}")
+        self.name = name
+        self.column = column
+        self.reduce = reduce
+        self.per = per
+        self.inner = inner
+        self.cells = cells
+        self.label = label
+
+    def __repr__(self):
+        return f"Metric({self.name!r}, {self.column!r}, {self.reduce!r}, per={self.per!r})"
+
+
+class KpiSet:
+    """Declared metrics of a group of cards, evaluated together.
+
+    Metrics sharing a source frame and ``per`` key are computed from one
+    grouping, so e.g. the mean Sales and Profit per order cost a single
+    ``groupby("Order_ID")``.
+    ``evaluate`` returns a namedtuple with a field per metric.
+    """
+
+    def __init__(self, name, metrics):
+        self.name = name
+        self.metrics = metrics
+        # registered on this module so results pickle (process compute pool)
+        self.result_type = namedtuple(name, [metric.name for metric in metrics],
+                                      module=__name__)
+        setattr(sys.modules[__name__], name, self.result_type)
+
+        self.passes = {}
+        for metric in metrics:
+            self.passes.setdefault((metric.cells, metric.per), []).append(metric)
+
+    def evaluate(self, rows, cells=None):
+        values = {}
+        for (use_cells, per), metrics in self.passes.items():
+            the_df = cells if use_cells and cells is not None else rows
+            table = self.table(the_df, per, metrics)
+            # per column: Series reductions are much cheaper than a
+            # DataFrame-wide one on frames this size
+            for metric in metrics:
+                values[metric.name] = REDUCERS[metric.reduce](table, metric)
+
+        return self.result_type(**values)
+
+    @staticmethod
+    def table(the_df, per, metrics):
+        if per is None:
+            return the_df
+        inner = {metric.column: metric.inner for metric in metrics}
+        grouped = the_df.groupby(per, observed=True, sort=False)
+        if len(set(inner.values())) == 1:
+            # e.g. grouped[["Sales", "Profit"]].sum(), faster than agg()
+            return getattr(grouped[list(inner)], next(iter(inner.values())))()
+        return grouped.agg(inner)
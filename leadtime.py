@@ -0,0 +1,73 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from filter_index import FilterIndex
+
+
+# what lead times are broken down by on the Logistics page
+LEAD_DIMENSIONS = ["Ship_Mode", "Region", "Order_Month"]
+
+# nearest-rank percentiles: the smallest lead time reached by that share of orders
+PERCENTILES = {"median": 0.5, "p90": 0.9}
+
+LeadTimeStats = namedtuple("LeadTimeStats", ["orders", "mean", *PERCENTILES])
+
+
+def count_orders(orders, by):
+    return orders.groupby(by, observed=True, sort=False).size().rename("Orders").reset_index()
+
+
+def summarize(histogram):
+    # histogram: order counts indexed by ascending Lead_Days
+    days = histogram.index.to_numpy()
+    counts = histogram.to_numpy()
+    total = counts.sum()
+    if not total:
+        return LeadTimeStats(0, np.nan, *(np.nan for _ in PERCENTILES))
+    cumulative = np.cumsum(counts)
+    return LeadTimeStats(
+        int(total), float(days @ counts / total),
+        *(int(days[np.searchsorted(cumulative, share * total)])
+          for share in PERCENTILES.values()))
+
+
+class LeadTimes:
+    """Order lead times (Ship_Date - Order_Date, in whole days) as histograms.
+
+    Order counts per State, Order_Year, Ship_Mode, Region, Order_Month and
+    Lead_Days are built once per dataset version from the order table, and
+    sliced through a FilterIndex like the cube. Lead days are integers, so
+    the mean and percentiles computed from the counts are exact. As in the
+    customer table, orders are counted once per category they have lines in,
+    in a second table only used with the category filter.
+    """
+
+    def __init__(self, order_table):
+        orders = order_table.orders
+        by = ["State", "Order_Year", *LEAD_DIMENSIONS, "Lead_Days"]
+        self.index = FilterIndex(count_orders(orders, by),
+                                 columns={"state": "State", "year": "Order_Year"})
+        self.category_index = FilterIndex(pd.concat([
+            count_orders(orders[orders[f"Lines_{category}"] > 0], by).assign(Category=category)
+            for category in order_table.categories], ignore_index=True))
+
+    def slice(self, form_data):
+        if form_data.get("category", "All") == "All":
+            return self.index.view(form_data)
+        return self.category_index.view(form_data)
+
+    def histogram(self, form_data, by=()):
+        return self.slice(form_data).groupby(
+            [*by, "Lead_Days"], observed=True)["Orders"].sum()
+
+    def summary(self, form_data):
+        return summarize(self.histogram(form_data))
+
+    def summary_by(self, form_data, by):
+        # one LeadTimeStats row per ``by`` value
+        groups = self.histogram(form_data, [by]).groupby(level=by, observed=True, sort=False)
+        stats = {value: summarize(histogram.droplevel(by)) for value, histogram in groups}
+        return pd.DataFrame.from_dict(
+            stats, orient="index", columns=LeadTimeStats._fields).rename_axis(by)
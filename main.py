@@ -1,49 +1,378 @@
+import time
+from startup import Startup, lazy_import
+
+_import_started = time.perf_counter()
+
+# pandas and plotly load on first use, during the dataset phase of the
+# lifespan rather than before the server can accept connections
+pd = lazy_import("pandas")
+px = lazy_import("plotly.express")
+
 import reactpy
-from reactpy import component, html, run, utils, use_state
-import pandas as pd
-import numpy as np
-import plotly.express as px
+from reactpy import create_context, html, run, use_context, use_effect, use_memo, use_state
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
 from reactpy.backend.fastapi import configure, Options
-from fastapi import FastAPI
-from reactpy_router import route, simple, link
-from reactpy_router.core import use_params
-
-app = FastAPI()
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+from reactpy_router import route, link
+from reactpy_router.core import create_router, use_params
+from reactpy_router.simple import SimpleResolver
+from snapshot import load_snapshot
+from schema import MONTH_NAMES, apply_schema, format_memory_report
+from filter_index import filter_form, filter_key, known_filter, set_filter_values
+from cube import Cube
+from customers import CustomerTable
+from orders import OrderTable
+from leadtime import LEAD_DIMENSIONS, LeadTimes
+from rollups import COMPARISONS, GRANULARITIES, TimeRollups
+from kpi import KpiSet, Metric
+from result_cache import ResultCache
+from plotly_chart import figure_json, plotly_chart
+from compute_pool import PENDING, ComputePool, ComputeTimeout, use_computation
+from page_scheduler import PageScheduler
+from warmup import WarmUp, prioritized_keys
+from assets import AssetRegistry
+import metrics
+from metrics import AGGREGATION_SECONDS, FIGURE_SECONDS, component, timed
+
+logger = logging.getLogger("dashboard.startup")
+startup = Startup(_import_started)
+startup.record("imports", _import_started)
+_app_started = time.perf_counter()
+
+
+async def start_dashboard():
+    # runs in the background: the server answers (readiness, loading page)
+    # while the dataset loads
+    try:
+        await asyncio.to_thread(load_dataset)
+    except Exception as error:
+        # nothing awaits this task: log the traceback, the pages and
+        # /_dashboard/ready report the failure
+        startup.set_failed(error)
+        logger.exception(startup.format_report())
+        return
+    logger.info(startup.format_report())
+    if os.environ.get("DASHBOARD_WARMUP") == "1":
+        await warmup.run()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    start_task = asyncio.create_task(start_dashboard())
+    yield
+    start_task.cancel()
+    compute_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 
-@component
-def my_router():
-    return simple.router(
-        route("/".home()),
-        route("/locations".locations()),
-        route("/customers".customers()),
-        route("/TimeSeries".time_series()),
-        route("/Logistics".logistics()),
-    )
+# ----------------------------------------------------------------
+# DASHBOARD_DATA_PATH points the dashboard at another dataset with the same
+# columns, e.g. one written by benchmarks/generate_data.py
+data__path = os.environ.get("DASHBOARD_DATA_PATH", r"Sample_Store.csv")
+
+# Where the dataset's snapshot goes, by default a .snapshot directory next to
+# the CSV; point DASHBOARD_SNAPSHOT_DIR elsewhere when that one is read-only.
+SNAPSHOT_DIR = os.environ.get("DASHBOARD_SNAPSHOT_DIR") or None
+
+# Bump whenever read_sample_store changes the columns it produces, so stale
+# snapshots get rebuilt.
+SNAPSHOT_VERSION = 3
+
+# The snapshot stores the rows in a file per Order_Year, and per Region too
+# with DASHBOARD_PARTITION_REGION=1. The tables below are built a partition at
+# a time, and raw rows are read back on demand, keeping at most
+# DASHBOARD_MEMORY_BUDGET_MB of partitions in memory.
+PARTITION_BY = (["Order_Year", "Region"] if os.environ.get("DASHBOARD_PARTITION_REGION") == "1"
+                else ["Order_Year"])
+MEMORY_BUDGET = int(float(os.environ.get("DASHBOARD_MEMORY_BUDGET_MB", 1024)) * 2**20)
+
+
+def read_sample_store(csv_path):
+    the_df = pd.read_csv(csv_path, encoding="unicode_escape")
+
+    the_df["Order_Date"] = pd.to_datetime(
+        the_df["Order_Date"], format="%m/%d/%Y")
+    the_df["Ship_Date"] = pd.to_datetime(
+        the_df["Ship_Date"], format="%m/%d/%Y")
+    # shipping lead time in whole days
+    the_df["Lead_Days"] = (the_df["Ship_Date"] - the_df["Order_Date"]).dt.days.astype("int16")
+
+    the_df["Order_Month"] = the_df["Order_Date"].dt.month_name()
+    the_df["Order_Year"] = the_df["Order_Date"].dt.year
+    return apply_schema(the_df)
+
+
+# Set by load_dataset(), which the app lifespan runs in the background
+row_store = dataset_info = cube = customer_table = order_table = lead_times = None
+time_rollups = None
+state_list = years_list = category_list = None
+
+# built from each data partition, then combined (see cube.py)
+TABLE_BUILDERS = [Cube, CustomerTable, OrderTable, TimeRollups]
+
+
+def first_rows(the_df, column):
+    # position in the source file of the first row with each value of column
+    return the_df.index.to_series().groupby(the_df[column], observed=True).min()
+
+
+def values_in_file_order(pieces):
+    return pd.concat(pieces).groupby(level=0, observed=True).min().sort_values().index.tolist()
+
+
+def load_dataset():
+    global row_store, dataset_info, cube, customer_table, order_table, lead_times
+    global time_rollups
+    global state_list, years_list, category_list
+    if startup.ready:
+        return
+
+    with startup.phase("data"):
+        row_store, dataset_info = load_snapshot(
+            data__path, read_sample_store, version=SNAPSHOT_VERSION,
+            snapshot_dir=SNAPSHOT_DIR, partition_by=PARTITION_BY, budget=MEMORY_BUDGET)
+    startup.details["source"] = dataset_info["source"]
+    startup.details["rows"] = len(row_store)
+    startup.details["partitions"] = len(row_store.partitions)
+
+    if "schema_report" in dataset_info.get("attrs", {}):
+        logger.info(format_memory_report(dataset_info["attrs"]["schema_report"]))
+
+    pieces = {builder: [] for builder in TABLE_BUILDERS}
+    firsts = {column: [] for column in ("State", "Order_Year", "Category")}
+    parts = row_store.frames()
+    while True:
+        # reading a partition is data, building from it indexes
+        with startup.phase("data"):
+            part = next(parts, None)
+        if part is None:
+            break
+        with startup.phase("indexes"):
+            for builder in TABLE_BUILDERS:
+                pieces[builder].append(builder.piece(part))
+            for column in firsts:
+                firsts[column].append(first_rows(part, column))
+
+    with startup.phase("indexes"):
+        cube, customer_table, order_table, time_rollups = (
+            builder.combine(pieces.pop(builder)) for builder in TABLE_BUILDERS)
+        # the pages only read the tables, raw rows are read again on demand
+        row_store.release()
+        lead_times = LeadTimes(order_table)
+
+        # menus list values in the order they first appear in the file
+        state_list = values_in_file_order(firsts["State"])
+        state_list.insert(0, "All")
+
+        # Years
+        years_list = values_in_file_order(firsts["Order_Year"])
+        years_list.insert(0, "All")
+
+        # Categoty
+        category_list = values_in_file_order(firsts["Category"])
+        category_list.insert(0, "All")
+        set_filter_values(state_list, years_list, category_list)
+
+    aggregation_cache.version = dataset_info["sha256"]
+    figure_cache.version = dataset_info["sha256"]
+    page_scheduler.version = dataset_info["sha256"]
+    warmup.keys = prioritized_keys(
+        state_list, years_list, category_list,
+        cube.cells.groupby("State", observed=True)["Rows"].sum().to_dict())
+
+    # the first figure pays for plotly's validators, do it before any user
+    with startup.phase("plotly"):
+        figure_json(px.bar(x=[0], y=[0]))
+
+    startup.set_ready()
 
 
 # ----------------------------------------------------------------
-data__path = r"Sample_Store.csv"
+# Aggregations, memoized per (state, year, category) and dataset version
+aggregation_cache = ResultCache(
+    maxsize=int(os.environ.get("DASHBOARD_CACHE_SIZE", 512)),
+    ttl=float(os.environ["DASHBOARD_CACHE_TTL"]) if os.environ.get("DASHBOARD_CACHE_TTL") else None)
+
+# Serialized figures, memoized the same way
+figure_cache = ResultCache(
+    maxsize=int(os.environ.get("DASHBOARD_FIGURE_CACHE_SIZE", 256)),
+    ttl=aggregation_cache.ttl)
+
+# Where data and figure computation runs, see DASHBOARD_COMPUTE. Process
+# workers load the dataset (from its snapshot) when they start.
+compute_pool = ComputePool.from_env(initializer=load_dataset)
+
+
+@app.get("/_dashboard/cache")
+def cache_stats():
+    return {"aggregations": aggregation_cache.stats(),
+            "figures": figure_cache.stats(),
+            "partitions": row_store.stats() if row_store is not None else None}
+
+
+def cube_for(the_key):
+    return cube.slice(filter_form(the_key))
+
+
+def orders_for(the_key):
+    return order_table.view(filter_form(the_key))
+
+
+# KPI cards, each set evaluated with one pass per grouping key (see kpi.py)
+HOME_KPIS = KpiSet("HomeKpis", [
+    Metric("sales", "Sales", "sum", cells=True),
+    Metric("profit", "Profit", "sum", cells=True),
+    Metric("quantity", "Quantity", "sum", cells=True),
+    # over customer_table.slice(), rows per customer and partition
+    Metric("customers", "Customer_ID", "nunique"),
+])
+
+LOCATIONS_KPIS = KpiSet("LocationsKpis", [
+    Metric("regions", "Region", "nunique", cells=True),
+    Metric("states", "State", "nunique", cells=True),
+    Metric("top_state", "Rows", "idxmax", per="State", cells=True),
+])
+
+# over customers_for(), one row per customer
+CUSTOMERS_KPIS = KpiSet("CustomersKpis", [
+    Metric("avg_sales", "Sales", "mean"),
+    Metric("avg_profit", "Profit", "mean"),
+    Metric("top_loyal", "Orders", "idxmax", label="Customer_Name"),
+])
+
+# over orders_for(), one row per order
+LOGISTICS_KPIS = KpiSet("LogisticsKpis", [
+    Metric("avg_sales", "Sales", "mean"),
+    Metric("avg_profit", "Profit", "mean"),
+    Metric("orders", None, "count"),
+])
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def home_totals(the_key):
+    return HOME_KPIS.evaluate(customer_table.slice(filter_form(the_key)), cube_for(the_key))
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def regions_sales(the_key):
+    return cube_for(the_key).groupby(
+        "Region", observed=True)["Sales"].sum().sort_values(ascending=False)
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def segments_sales(the_key):
+    return cube_for(the_key).groupby("Segment", observed=True)["Sales"].sum()
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def locations_totals(the_key):
+    # every locations card reads the cube
+    return LOCATIONS_KPIS.evaluate(cube_for(the_key))
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def top_10_states_sales(the_key):
+    return cube_for(the_key).groupby(
+        "State", observed=True)["Sales"].sum().nlargest(10)
+
+
+def customers_for(the_key):
+    # one row per customer, read by the three customers page aggregations
+    # below; only their (small) results are cached
+    return customer_table.view(filter_form(the_key))
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def customers_totals(the_key):
+    return CUSTOMERS_KPIS.evaluate(customers_for(the_key))
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def customers_by_segment(the_key):
+    customers_by_segemnt = customers_for(the_key)["Segment"].value_counts()
+    return customers_by_segemnt[customers_by_segemnt > 0]
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def customers_via_years(the_key):
+    # customers counted in the year of their first order
+    first_years = customers_for(the_key)["First_Order_Date"].dt.year
+    return first_years.rename("Order_Year").value_counts().sort_index()
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def measure_via_year_month(the_key, measure):
+    months = time_rollups.slice(filter_form(the_key), "month")
+    via_year_month = months.groupby(
+        [months["Period"].dt.month, "Order_Year"])[measure].sum().unstack("Order_Year")
+
+    via_year_month.index = [MONTH_NAMES[month - 1][:3] for month in via_year_month.index]
+    return via_year_month
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def measures_via_period(the_key, granularity):
+    # granularity is one of GRANULARITIES
+    return time_rollups.series(filter_form(the_key), granularity)
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def logistics_totals(the_key):
+    return LOGISTICS_KPIS.evaluate(orders_for(the_key))
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def lead_time_totals(the_key):
+    return lead_times.summary(filter_form(the_key))
+
+
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def lead_time_histogram(the_key):
+    return lead_times.histogram(filter_form(the_key))
 
-df = pd.read_csv(data__path, encoding="unicode_escape")
 
-df["Order_Date"] = pd.to_datetime(df["Order_Date"])
-df["Ship_Date"] = pd.to_datetime(df["Ship_Date"])
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def lead_time_by(the_key, by):
+    # by is one of LEAD_DIMENSIONS
+    return lead_times.summary_by(filter_form(the_key), by)
 
-df["Order_Month"] = df["Order_Date"].dt.month_name()
-df["Order_Year"] = df["Order_Date"].dt.year
 
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def category_subcategory(the_key):
+    return cube_for(the_key).groupby(
+        ["Category", "Sub_Category"], as_index=False, observed=True)["Quantity"].sum()
 
-state_list = df["State"].unique().tolist()
-state_list.insert(0, "All")
 
-# Years
-years_list = df["Order_Year"].unique().tolist()
-years_list.insert(0, "All")
+@aggregation_cache.memoize
+@timed(AGGREGATION_SECONDS)
+def period_growth(the_key, granularity, periods):
+    # percent change of Sales, Profit and Quantity per period, see TimeRollups.growth
+    return time_rollups.growth(filter_form(the_key), granularity, periods).round(2)
 
-# Categoty
-category_list = df["Category"].unique().tolist()
-category_list.insert(0, "All")
+
+def year_over_year_growth(the_key):
+    return period_growth(the_key, *COMPARISONS["yoy"])
 
 # Main Function of Vizualizations
 
@@ -135,8 +464,9 @@ def create_chart_vizualization(the_data, chart_type="bar", xlabel="X_Label",
 
 
 @component
-def create_sales_category_chart(the_df):
-    category_by_slaes = the_df.groupby("Category")["Sales"].sum()
+def create_sales_category_chart(the_cube):
+    category_by_slaes = the_cube.groupby(
+        "Category", observed=True)["Sales"].sum()
     fig = px.pie(names=category_by_slaes.index,
                  values=category_by_slaes,
                  title="Total Sales By Category",
@@ -173,18 +503,28 @@ def create_sales_category_chart(the_df):
     return fig
 
 
-state_filt = state_list[0]
-years_filt = years_list[0]
-category_filt = category_list[0]
-form_data = {"state": "All", "year": "All", "category": "All"}
+# ----------------------------------------------------------------
+# Filters applied by the sidebar form, scoped to each ReactPy session
+default_form_data = {"state": "All", "year": "All", "category": "All"}
+
+filters_context = create_context(None)
+
+
+@component
+def filters_provider(*children):
+    form_data, set_form_data = use_state(default_form_data)
+    filters = use_memo(lambda: (form_data, set_form_data), [form_data])
+    return filters_context(*children, value=filters)
+
+
+def use_filters():
+    # (form_data, set_form_data) of the current session
+    return use_context(filters_context)
 
 
 @component
 def select_menu(the_state, the_year, the_category):
-    global state_filt
-    global years_filt
-    global category_filt
-    global form_data
+    form_data, set_form_data = use_filters()
 
     div_class = {
         "class": "flex max-full flex-col gap-y-1 p-2 rounded-md bg-black"
@@ -194,16 +534,14 @@ def select_menu(the_state, the_year, the_category):
     }
     select_menu_class = "text-gray-300 mt-1 cursor-pointer block w-full py-2 px-3 bg-gray-700 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm"
 
-    state_filt, set_state_filt = use_state(state_list[0])
-    years_filt, set_years_filt = use_state(years_list[0])
-    category_filt, set_category_filt = use_state(category_list[0])
-    form_data, set_form_data = use_state(
-        {"state": "All", "year": "All", "category": "All"})
+    state_filt, set_state_filt = use_state(the_state)
+    years_filt, set_years_filt = use_state(the_year)
+    category_filt, set_category_filt = use_state(the_category)
 
     select_states_options = html.select({
         "id": "states-select",
         "name": "states",
-        "value": the_state,
+        "value": state_filt,
         "class": select_menu_class,
         "on_change": lambda e: set_state_filt(e["target"]["value"]),
     }, [html.option({"value": i, "class": "text-white"}, i) for i in state_list],
@@ -212,7 +550,7 @@ def select_menu(the_state, the_year, the_category):
     select_years_options = html.select({
         "id": "years-select",
         "name": "years",
-        "value": the_year,
+        "value": years_filt,
         "class": select_menu_class,
         "on_change": lambda e: set_years_filt(e["target"]["value"]),
     }, [html.option({"value": i, "class": "text-white"}, i) for i in years_list],
@@ -221,20 +559,22 @@ def select_menu(the_state, the_year, the_category):
     select_category_options = html.select({
         "id": "category-select",
         "name": "category",
-        "value": the_category,
+        "value": category_filt,
         "class": select_menu_class,
         "on_change": lambda e: set_category_filt(e["target"]["value"]),
     }, [html.option({"value": i, "class": "text-white"}, i) for i in category_list],
     )
 
-    @reactpy.event(prevent_default=False)
+    @reactpy.event(prevent_default=True)
     def handle_submit(event):
         data = {}
         data["state"] = event["target"]["elements"][0]["value"]
         data["year"] = event["target"]["elements"][1]["value"]
         data["category"] = event["target"]["elements"][2]["value"]
 
-        set_form_data(data)
+        # the values come from the client, only take the menus' own
+        if known_filter(data):
+            set_form_data(data)
 
     menus = html.form(
         {"class": "text-black py-0 sm:py-1", "on_submit": handle_submit},
@@ -295,6 +635,7 @@ def select_menu(the_state, the_year, the_category):
 
 @component
 def side_bar():
+    form_data, set_form_data = use_filters()
 
     side_bar = html.aside(
         {"id": "default-sidebar", "class": "relative bg-#0f1729 fixed top-0 left-0 z-40 w-full h-screen transition-transform -translate-x-full sm:translate-x-0",
@@ -304,73 +645,58 @@ def side_bar():
             html.ul(
                 {"class": "space-y-2 font-bold"},
                 html.li(
-                    html.a(
-                        {
-                            "class": "flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
-                            "href": "/",
-                            "aria-current": "page"},
-
+                    link(
                         html.span(
                             {"class": "ms-3"},
                             "Sales"
 
-                        )
+                        ),
+                        to="/",
+                        className="flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
                     )
                 ),
                 html.li(
-                    html.a(
-                        {
-                            "class": "flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
-                            "href": "/locations",
-                            "aria-current": "page"},
-
+                    link(
                         html.span(
                             {"class": "ms-3"},
                             "Locations"
 
-                        )
+                        ),
+                        to="/locations",
+                        className="flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
                     )
                 ),
                 html.li(
-                    html.a(
-                        {
-                            "class": "flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
-                            "href": "/customers",
-                            "aria-current": "page"},
-
+                    link(
                         html.span(
                             {"class": "ms-3"},
                             "Customers"
 
-                        )
+                        ),
+                        to="/customers",
+                        className="flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
                     )
                 ),
                 html.li(
-                    html.a(
-                        {
-                            "class": "flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
-                            "href": "/TimeSeries",
-                            "aria-current": "page"},
-
+                    link(
                         html.span(
                             {"class": "ms-3"},
                             "Time Series"
 
-                        )
+                        ),
+                        to="/TimeSeries",
+                        className="flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
                     )
                 ),
                 html.li(
-                    html.a(
-                        {
-                            "class": "flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
-                            "href": "/Logistics",
-                            "aria-current": "page"},
-
+                    link(
                         html.span(
                             {"class": "ms-3"},
                             "Logistics"
 
-                        )
+                        ),
+                        to="/Logistics",
+                        className="flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
                     )
                 ),
                 html.hr(),
@@ -393,9 +719,38 @@ def side_bar():
     return side_bar
 
 
+@component
+def pending_section(result, height=500):
+    # shown while a card or chart is computed in the pool, or if it failed;
+    # also for the whole dashboard while the dataset loads, or if it failed
+    if result is PENDING:
+        message = "Loading..."
+    elif isinstance(result, ComputeTimeout):
+        message = "This chart took too long to compute"
+    elif startup.error is not None and result is startup.error:
+        message = "The dashboard data could not be loaded"
+    else:
+        message = "This chart could not be computed"
+    return html.section(
+        {"class": "text-black py-2 sm:py-3"},
+        html.div(
+            {"class": "mx-auto max-w-7xl px-6 lg:px-8"},
+            html.div(
+                {"class": "flex items-center justify-center p-2 rounded-md bg-black text-gray-300 text-xl font-bold",
+                 "style": {"height": f"{height}px"}},
+                message
+            )
+        ),
+    )
+
+
+def is_pending(result):
+    return result is PENDING or isinstance(result, Exception)
+
+
 # ==================== Start Home Page Components =======================
 @component
-def create_home_cards(the_df, page_title):
+def create_home_cards(totals, page_title):
     div_class = {
         "class": "flex max-w-xs sm:max-w flex-col gap-y-4 border-2 border-blue-300 p-5 rounded-md bg-black transition "
                  "duration-300 ease-in-out hover:bg-gray-900"
@@ -426,7 +781,7 @@ def create_home_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        f'${the_df["Sales"].sum():,.0f}'
+                        f'${totals.sales:,.0f}'
                     )
                 ),
 
@@ -437,7 +792,7 @@ def create_home_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        f'${the_df["Profit"].sum():,.0f}'
+                        f'${totals.profit:,.0f}'
                     )
                 ),
                 html.div(
@@ -447,7 +802,7 @@ def create_home_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        f'{the_df["Quantity"].sum():,.0f}'
+                        f'{totals.quantity:,.0f}'
                     )
                 ),
 
@@ -458,7 +813,7 @@ def create_home_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        f'{the_df["Customer_ID"].nunique():,.0f}'
+                        f'{totals.customers:,.0f}'
                     )
                 )
 
@@ -469,36 +824,37 @@ def create_home_cards(the_df, page_title):
     return cards
 
 
-@component
-def create_shipping_segment_chart(the_df):
-    div_class = {
-        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
-    }
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def regions_sales_figure(the_key):
     # Shipping Mode Bar Chart
-    regions_sales = the_df.groupby(
-        "Region")["Sales"].sum().sort_values(ascending=False)
-
-    fig_regions_sales = create_chart_vizualization(regions_sales, chart_type="bar", xlabel="Region",
+    fig_regions_sales = create_chart_vizualization(regions_sales(the_key), chart_type="bar", xlabel="Region",
                                                    ylabel="Sales",
                                                    the_title="Total Sales Via Regions",
                                                    bar_colors=[
                                                        "#067fd6", "#01B075", "#705DDF", "#FF625B"],
 
                                                    hover_html_template="Region: <b>%{x}</b><br># Total Sales: %{y:.3s}")
+    return figure_json(fig_regions_sales)
 
-    fig_regions_sales = fig_regions_sales.to_html(include_plotlyjs='cdn', config={
-        'displayModeBar': False})
 
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def segments_sales_figure(the_key):
     # Customers Segments Pie Chart
-    segments = the_df.groupby("Segment")["Sales"].sum()
-
-    fig_segments = create_chart_vizualization(segments, chart_type="pie",
+    fig_segments = create_chart_vizualization(segments_sales(the_key), chart_type="pie",
                                               the_title="Sales By Customer Segmentation",
                                               bar_colors=[
                                                   "#067fd6", "#01B075", "#705DDF", "#FF625B"],
                                               hover_html_template="Customer Segment: %{label}<br>Frequency: %{value:,.0f}<br>Frequency PCT(%): %{percent}")
-    fig_segments = fig_segments.to_html(include_plotlyjs='cdn', config={
-        'displayModeBar': False})
+    return figure_json(fig_segments)
+
+
+@component
+def create_shipping_segment_chart(regions_figure, segments_figure):
+    div_class = {
+        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
+    }
 
     chart = html.section(
         {"class": "text-black py-2 sm:py-3"},
@@ -508,12 +864,12 @@ def create_shipping_segment_chart(the_df):
                 {"class": "grid grid-cols-2 xs:grid-cols-1 sm:grid-cols-1 gap-x-1 gap-y-2 text-center lg:grid-cols-2"},
                 html.div(
                     div_class,
-                    utils.html_to_vdom(fig_regions_sales)
+                    plotly_chart(regions_figure)
                 ),
 
                 html.div(
                     div_class,
-                    utils.html_to_vdom(fig_segments)
+                    plotly_chart(segments_figure)
 
                 ),
 
@@ -524,21 +880,11 @@ def create_shipping_segment_chart(the_df):
 
 
 @component
-def create_profit_year_chart(the_df):
+def create_profit_year_chart(figure):
     div_class = {
         "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
     }
 
-    profit_via_year = round(the_df.groupby("Order_Year")["Profit"].sum())
-
-    fig_profit_year = create_chart_vizualization(profit_via_year, chart_type="line", xlabel="Year",
-                                                 ylabel="Total Profit",
-                                                 the_title="Total Profit Via Years",
-                                                 hover_html_template="Year: <b>%{x}</b><br>Total Profit: %{y:,}", height=550)
-
-    fig_profit_year = fig_profit_year.to_html(include_plotlyjs='cdn', config={
-        'displayModeBar': False})
-
     chart = html.section(
         {"class": "text-black py-2 sm:py-4"},
         html.div(
@@ -547,7 +893,7 @@ def create_profit_year_chart(the_df):
                 {"class": "grid grid-cols-1 xs:grid-cols-1 gap-x-1 gap-y-2 text-center lg:grid-cols-1"},
                 html.div(
                     div_class,
-                    utils.html_to_vdom(fig_profit_year)
+                    plotly_chart(figure)
                 ),
             )
         ),
@@ -560,10 +906,7 @@ def create_profit_year_chart(the_df):
 
 @component
 def select_menu_loc(the_state, the_year, the_category):
-    global state_filt
-    global years_filt
-    global category_filt
-    global form_data
+    form_data, set_form_data = use_filters()
 
     div_class = {
         "class": "flex max-full flex-col gap-y-1 p-2 rounded-md bg-black"
@@ -573,16 +916,14 @@ def select_menu_loc(the_state, the_year, the_category):
     }
     select_menu_class = "text-gray-300 mt-1 cursor-pointer block w-full py-2 px-3 bg-gray-700 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm"
 
-    state_filt, set_state_filt = use_state(state_list[0])
-    years_filt, set_years_filt = use_state(years_list[0])
-    category_filt, set_category_filt = use_state(category_list[0])
-    form_data, set_form_data = use_state(
-        {"state": "All", "year": "All", "category": "All"})
+    state_filt, set_state_filt = use_state(the_state)
+    years_filt, set_years_filt = use_state(the_year)
+    category_filt, set_category_filt = use_state(the_category)
 
     select_states_options = html.select({
         "id": "states-select",
         "name": "states",
-        "value": the_state,
+        "value": state_filt,
         "class": select_menu_class,
         "on_change": lambda e: set_state_filt(e["target"]["value"]),
     }, [html.option({"value": i, "class": "text-white"}, i) for i in state_list],
@@ -591,7 +932,7 @@ def select_menu_loc(the_state, the_year, the_category):
     select_years_options = html.select({
         "id": "years-select",
         "name": "years",
-        "value": the_year,
+        "value": years_filt,
         "class": select_menu_class,
         "on_change": lambda e: set_years_filt(e["target"]["value"]),
     }, [html.option({"value": i, "class": "text-white"}, i) for i in years_list],
@@ -600,20 +941,22 @@ def select_menu_loc(the_state, the_year, the_category):
     select_category_options = html.select({
         "id": "category-select",
         "name": "category",
-        "value": the_category,
+        "value": category_filt,
         "class": select_menu_class,
         "on_change": lambda e: set_category_filt(e["target"]["value"]),
     }, [html.option({"value": i, "class": "text-white"}, i) for i in category_list],
     )
 
-    @reactpy.event(prevent_default=False)
+    @reactpy.event(prevent_default=True)
     def handle_submit(event):
         data = {}
         data["state"] = event["target"]["elements"][0]["value"]
         data["year"] = event["target"]["elements"][1]["value"]
         data["category"] = event["target"]["elements"][2]["value"]
 
-        set_form_data(data)
+        # the values come from the client, only take the menus' own
+        if known_filter(data):
+            set_form_data(data)
 
     menus = html.form(
         {"class": "text-black py-0 sm:py-1", "on_submit": handle_submit},
@@ -673,6 +1016,7 @@ def select_menu_loc(the_state, the_year, the_category):
 
 @component
 def side_bar_loc():
+    form_data, set_form_data = use_filters()
 
     side_bar = html.aside(
         {"id": "default-sidebar", "class": "relative bg-#0f1729 fixed top-0 left-0 z-40 w-full h-screen transition-transform -translate-x-full sm:translate-x-0",
@@ -682,73 +1026,58 @@ def side_bar_loc():
             html.ul(
                 {"class": "space-y-2 font-bold"},
                 html.li(
-                    html.a(
-                        {
-                            "class": "flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
-                            "href": "/",
-                            "aria-current": "page"},
-
+                    link(
                         html.span(
                             {"class": "ms-3"},
                             "Sales"
 
-                        )
+                        ),
+                        to="/",
+                        className="flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
                     )
                 ),
                 html.li(
-                    html.a(
-                        {
-                            "class": "flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
-                            "href": "/locations",
-                            "aria-current": "page"},
-
+                    link(
                         html.span(
                             {"class": "ms-3"},
                             "Locations"
 
-                        )
+                        ),
+                        to="/locations",
+                        className="flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
                     )
                 ),
                 html.li(
-                    html.a(
-                        {
-                            "class": "flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
-                            "href": "/customers",
-                            "aria-current": "page"},
-
+                    link(
                         html.span(
                             {"class": "ms-3"},
                             "Customers"
 
-                        )
+                        ),
+                        to="/customers",
+                        className="flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
                     )
                 ),
                 html.li(
-                    html.a(
-                        {
-                            "class": "flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
-                            "href": "/TimeSeries",
-                            "aria-current": "page"},
-
+                    link(
                         html.span(
                             {"class": "ms-3"},
                             "Time Series"
 
-                        )
+                        ),
+                        to="/TimeSeries",
+                        className="flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
                     )
                 ),
                 html.li(
-                    html.a(
-                        {
-                            "class": "flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
-                            "href": "/Logistics",
-                            "aria-current": "page"},
-
+                    link(
                         html.span(
                             {"class": "ms-3"},
                             "Logistics"
 
-                        )
+                        ),
+                        to="/Logistics",
+                        className="flex items-center p-2 text-white rounded-lg dark:text-white hover:bg-blue-100 hover:text-black group",
                     )
                 ),
                 html.hr(),
@@ -770,7 +1099,7 @@ def side_bar_loc():
 
 
 @component
-def create_locations_cards(the_df, page_title):
+def create_locations_cards(totals, page_title):
     div_class = {
         "class": "flex max-w-xs sm:max-w flex-col gap-y-4 border-2 border-blue-300 p-5 rounded-md bg-black transition "
                  "duration-300 ease-in-out hover:bg-gray-900"
@@ -801,7 +1130,7 @@ def create_locations_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        f'{the_df["Region"].nunique():,.0f}'
+                        f'{totals.regions:,.0f}'
                     )
                 ),
 
@@ -812,7 +1141,7 @@ def create_locations_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        f'{the_df["State"].nunique():,.0f}'
+                        f'{totals.states:,.0f}'
                     )
                 ),
 
@@ -824,7 +1153,7 @@ def create_locations_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        the_df["State"].value_counts().idxmax()
+                        totals.top_state
                     )
                 )
 
@@ -882,22 +1211,25 @@ def create_top_10_states(the_data, chart_type="bar", xlabel="X_Label",
     return fig
 
 
-def create_top_10_state_chart(the_df):
-    div_class = {
-        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
-    }
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def top_10_state_figure(the_key):
     # Shipping Mode Bar Chart
-    top_10_states_sales = the_df.groupby("State")["Sales"].sum().nlargest(10)
-
-    fig_top_10_states_sales = create_top_10_states(top_10_states_sales, chart_type="bar", orientation="h", xlabel="Total Sales",
+    fig_top_10_states_sales = create_top_10_states(top_10_states_sales(the_key), chart_type="bar", orientation="h", xlabel="Total Sales",
                                                    ylabel="State",
                                                    the_title="Top 5 State Via Sales",
                                                    bar_colors=["#067fd6"],
 
                                                    hover_html_template="The State: <b>%{y}</b><br>Total Sales: %{x:.5s}")
 
-    fig_top_10_states_sales = fig_top_10_states_sales.to_html(include_plotlyjs='cdn', config={
-        'displayModeBar': False})
+    return figure_json(fig_top_10_states_sales)
+
+
+@component
+def create_top_10_state_chart(figure):
+    div_class = {
+        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
+    }
 
     chart = html.section(
         {"class": "text-black py-2 sm:py-3"},
@@ -907,12 +1239,12 @@ def create_top_10_state_chart(the_df):
                 {"class": "grid grid-cols-1 xs:grid-cols-1 sm:grid-cols-1 gap-x-1 gap-y-2 text-center lg:grid-cols-1"},
                 html.div(
                     div_class,
-                    utils.html_to_vdom(fig_top_10_states_sales)
+                    plotly_chart(figure)
                 ),
 
                 # html.div(
                 #     div_class,
-                #     utils.html_to_vdom(fig_segments)
+                #     plotly_chart(fig_segments)
 
                 # ),
 
@@ -926,7 +1258,7 @@ def create_top_10_state_chart(the_df):
 
 
 @component
-def create_customers_cards(the_df, page_title):
+def create_customers_cards(totals, page_title):
     div_class = {
         "class": "flex max-w-xs sm:max-w flex-col gap-y-4 border-2 border-blue-300 p-5 rounded-md bg-black transition "
                  "duration-300 ease-in-out hover:bg-gray-900"
@@ -957,7 +1289,7 @@ def create_customers_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        f'${the_df.groupby("Customer_ID")["Sales"].sum().mean():,.2f}'
+                        f'${totals.avg_sales:,.2f}'
                     )
                 ),
 
@@ -968,7 +1300,7 @@ def create_customers_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        f'${the_df.groupby("Customer_ID")["Profit"].sum().mean():,.2f}'
+                        f'${totals.avg_profit:,.2f}'
                     )
                 ),
 
@@ -979,8 +1311,7 @@ def create_customers_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        the_df.drop_duplicates(subset="Order_ID")[
-                            "Customer_Name"].value_counts().idxmax()
+                        totals.top_loyal
                     )
                 )
 
@@ -991,11 +1322,7 @@ def create_customers_cards(the_df, page_title):
     return cards
 
 
-def create_customers_segment(the_df):
-    the_df = the_df.drop_duplicates()
-
-    customers_by_segemnt = the_df.drop_duplicates(
-        "Customer_ID")["Segment"].value_counts()
+def create_customers_segment(customers_by_segemnt):
 
     fig = px.pie(names=customers_by_segemnt.index,
                  values=customers_by_segemnt,
@@ -1034,28 +1361,31 @@ def create_customers_segment(the_df):
     return fig
 
 
-@component
-def create_customers_charts(the_df):
-    div_class = {
-        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
-    }
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def customers_segment_figure(the_key):
+    customers_segment = create_customers_segment(
+        customers_by_segment(the_key))
+    return figure_json(customers_segment)
 
-    customers_segment = create_customers_segment(the_df)
-
-    fig_customers_segment = customers_segment.to_html(include_plotlyjs='cdn', config={
-        'displayModeBar': False})
 
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def customers_via_years_figure(the_key):
     # Customer Evolution
-    customers_via_years = the_df.drop_duplicates(
-        "Customer_ID")["Order_Year"].value_counts().sort_index()
-
-    customers_via_years = create_chart_vizualization(customers_via_years, chart_type="line", xlabel="Year",
+    customers_via_years_fig = create_chart_vizualization(customers_via_years(the_key), chart_type="line", xlabel="Year",
                                                      ylabel="Total Customer",
                                                      the_title="The Increasing of Customers Via Years",
                                                      hover_html_template="Year: <b>%{x}</b><br>Total Customer: %{y:,}", height=500)
 
-    fig_customers_via_years = customers_via_years.to_html(include_plotlyjs='cdn', config={
-        'displayModeBar': False})
+    return figure_json(customers_via_years_fig)
+
+
+@component
+def create_customers_charts(via_years_figure, segment_figure):
+    div_class = {
+        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
+    }
 
     chart = html.section(
         {"class": "text-black py-2 sm:py-3"},
@@ -1065,12 +1395,12 @@ def create_customers_charts(the_df):
                 {"class": "grid grid-cols-2 xs:grid-cols-1 sm:grid-cols-1 gap-x-1 gap-y-2 text-center lg:grid-cols-2"},
                 html.div(
                     div_class,
-                    utils.html_to_vdom(fig_customers_via_years)
+                    plotly_chart(via_years_figure)
                 ),
 
                 html.div(
                     div_class,
-                    utils.html_to_vdom(fig_customers_segment)
+                    plotly_chart(segment_figure)
 
                 ),
 
@@ -1133,30 +1463,51 @@ def create_line_chart(the_df, xlabel="X", ylabel="Y", title="Title", hover_html_
     return fig
 
 
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def slaes_via_months_figure(the_key):
+    slaes_via_year_month = create_line_chart(measure_via_year_month(the_key, "Sales"), xlabel="Month", ylabel="Sales",
+                                             title="Sales Via Month Per Each Year", hover_html_template="Month: <b>%{x}</b><br>Total Sales: %{y:.3s}")
+
+    return figure_json(slaes_via_year_month)
+
+
 @component
-def create_slaes_via_months_charts(the_df):
+def create_slaes_via_months_charts(figure):
     div_class = {
         "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
     }
-    slaes_via_year_month = the_df.pivot_table(
-        index=the_df["Order_Date"].dt.month, columns="Order_Year", values="Sales", aggfunc="sum")
 
-    months_name = ["Jan", "Feb", "Mar", "Apr",
-                   "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    chart = html.section(
+        {"class": "text-black py-2 sm:py-3"},
+        html.div(
+            {"class": "mx-auto max-w-7xl px-6 lg:px-8"},
+            html.dl(
+                {"class": "grid grid-cols-1 xs:grid-cols-1 sm:grid-cols-1 gap-x-1 gap-y-2 text-center lg:grid-cols-1"},
+                html.div(
+                    div_class,
+                    plotly_chart(figure)
+                )
+            )
+        ),
+    )
+    return chart
 
-    x = slaes_via_year_month.index
-    displayes_months_name = []
 
-    for i in x:
-        displayes_months_name.append(months_name[i-1])
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def profit_via_months_figure(the_key):
+    profit_via_year_month = create_line_chart(measure_via_year_month(the_key, "Profit"), xlabel="Month", ylabel="Profit",
+                                              title="Profit Via Month Per Each Year", hover_html_template="Month: <b>%{x}</b><br>Total Profit: %{y:.3s}")
 
-    slaes_via_year_month.index = displayes_months_name
+    return figure_json(profit_via_year_month)
 
-    slaes_via_year_month = create_line_chart(slaes_via_year_month, xlabel="Month", ylabel="Sales",
-                                             title="Sales Via Month Per Each Year", hover_html_template="Month: <b>%{x}</b><br>Total Sales: %{y:.3s}")
 
-    fig_slaes_via_year_month = slaes_via_year_month.to_html(include_plotlyjs='cdn', config={
-        'displayModeBar': False})
+@component
+def create_profit_via_months_charts(figure):
+    div_class = {
+        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
+    }
 
     chart = html.section(
         {"class": "text-black py-2 sm:py-3"},
@@ -1166,7 +1517,7 @@ def create_slaes_via_months_charts(the_df):
                 {"class": "grid grid-cols-1 xs:grid-cols-1 sm:grid-cols-1 gap-x-1 gap-y-2 text-center lg:grid-cols-1"},
                 html.div(
                     div_class,
-                    utils.html_to_vdom(fig_slaes_via_year_month)
+                    plotly_chart(figure)
                 )
             )
         ),
@@ -1174,30 +1525,147 @@ def create_slaes_via_months_charts(the_df):
     return chart
 
 
+# granularity -> (label, hover date format)
+GRANULARITY_LABELS = {
+    "day": ("Day", "%b %d, %Y"),
+    "week": ("Week", "Week of %b %d, %Y"),
+    "month": ("Month", "%b %Y"),
+    "quarter": ("Quarter", "%b %Y"),
+    "year": ("Year", "%Y"),
+}
+
+
+def create_timeline_chart(via_period, granularity):
+    label, date_format = GRANULARITY_LABELS[granularity]
+    fig = px.line(via_period.rename_axis(index=label, columns="Measure"),
+                  color_discrete_sequence=["#067fd6", "#01B075"],
+                  labels={"value": "Amount"},
+                  title=f"Sales And Profit Per {label}",
+                  # a marker per point only while they stay readable
+                  markers=granularity in ("month", "quarter"),
+                  height=500,
+                  template="plotly_dark",
+                  )
+
+    fig.update_traces(
+        marker=dict(size=8, line=dict(color='#111', width=1)),
+        hovertemplate=f"{label}: <b>%{{x|{date_format}}}</b><br>%{{fullData.name}}: %{{y:.3s}}",
+    )
+
+    fig.update_layout(
+        showlegend=True,
+        title={
+            "font": {
+                "size": 25,
+                "family": "tahoma",
+            }
+        },
+        hoverlabel={
+            "bgcolor": "#123",
+            "font_size": 17,
+            "font_family": "tahoma"
+        }
+    )
+    return fig
+
+
+def create_growth_chart(growth, granularity, the_title, height=500):
+    label, date_format = GRANULARITY_LABELS[granularity]
+    fig = px.line(growth.rename_axis(index=label, columns="Measure"),
+                  color_discrete_sequence=["#067fd6", "#01B075", "#FCDDB0"],
+                  labels={"value": "Growth (%)"},
+                  title=the_title,
+                  markers=granularity in ("month", "quarter", "year"),
+                  height=height,
+                  template="plotly_dark",
+                  )
+
+    fig.update_traces(
+        marker=dict(size=8, line=dict(color='#111', width=1)),
+        hovertemplate=f"{label}: <b>%{{x|{date_format}}}</b><br>%{{fullData.name}}: %{{y}}%",
+    )
+
+    fig.update_layout(
+        showlegend=True,
+        title={
+            "font": {
+                "size": 25,
+                "family": "tahoma",
+            }
+        },
+        hoverlabel={
+            "bgcolor": "#123",
+            "font_size": 17,
+            "font_family": "tahoma"
+        }
+    )
+    if granularity == "year":
+        fig.update_xaxes(dtick="M12", tickformat="%Y")
+    return fig
+
+
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def timeline_figure(the_key, granularity):
+    timeline = create_timeline_chart(
+        measures_via_period(the_key, granularity)[["Sales", "Profit"]], granularity)
+    return figure_json(timeline)
+
+
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def timeline_growth_figure(the_key, granularity):
+    label = GRANULARITY_LABELS[granularity][0]
+    growth = create_growth_chart(period_growth(the_key, granularity, 1), granularity,
+                                 f"{label}-Over-{label} Growth")
+    return figure_json(growth)
+
+
 @component
-def create_profit_via_months_charts(the_df):
-    div_class = {
-        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
+def granularity_menu(granularity, set_granularity):
+    label_class = {
+        "class": "block text-l font-md text-white text-left"
     }
-    profit_via_year_month = the_df.pivot_table(
-        index=the_df["Order_Date"].dt.month, columns="Order_Year", values="Profit", aggfunc="sum")
-
-    months_name = ["Jan", "Feb", "Mar", "Apr",
-                   "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+    select_menu_class = "text-gray-300 mt-1 cursor-pointer block w-full py-2 px-3 bg-gray-700 rounded-md shadow-sm focus:outline-none focus:ring-2 focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm"
 
-    x = profit_via_year_month.index
-    displayes_months_name = []
+    def handle_change(event):
+        if event["target"]["value"] in GRANULARITIES:
+            set_granularity(event["target"]["value"])
 
-    for i in x:
-        displayes_months_name.append(months_name[i-1])
+    select_granularity_options = html.select({
+        "id": "granularity-select",
+        "name": "granularity",
+        "value": granularity,
+        "class": select_menu_class,
+        "on_change": handle_change,
+    }, [html.option({"value": value, "class": "text-white"}, label)
+        for value, (label, _) in GRANULARITY_LABELS.items()],
+    )
 
-    profit_via_year_month.index = displayes_months_name
+    menu = html.section(
+        {"class": "text-black py-2 sm:py-2"},
+        html.div(
+            {"class": "mx-auto max-w-7xl px-6 lg:px-8"},
+            html.div(
+                {"class": "flex max-w-xs flex-col gap-y-1 p-2 rounded-md bg-black"},
+                html.label(
+                    label_class,
+                    'Granularity: ',
+                    html.span(
+                        {"class": "text-blue-300 font-bold"}, GRANULARITY_LABELS[granularity][0])
+                ),
+                select_granularity_options
+            )
+        ),
+    )
+    return menu
 
-    profit_via_year_month = create_line_chart(profit_via_year_month, xlabel="Month", ylabel="Profit",
-                                              title="Profit Via Month Per Each Year", hover_html_template="Month: <b>%{x}</b><br>Total Profit: %{y:.3s}")
 
-    fig_profit_via_year_month = profit_via_year_month.to_html(include_plotlyjs='cdn', config={
-        'displayModeBar': False})
+@component
+def create_timeline_charts(figure):
+    div_class = {
+        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
+    }
 
     chart = html.section(
         {"class": "text-black py-2 sm:py-3"},
@@ -1207,7 +1675,7 @@ def create_profit_via_months_charts(the_df):
                 {"class": "grid grid-cols-1 xs:grid-cols-1 sm:grid-cols-1 gap-x-1 gap-y-2 text-center lg:grid-cols-1"},
                 html.div(
                     div_class,
-                    utils.html_to_vdom(fig_profit_via_year_month)
+                    plotly_chart(figure)
                 )
             )
         ),
@@ -1219,7 +1687,7 @@ def create_profit_via_months_charts(the_df):
 # ==================== Start Logistics Page Components =======================
 
 @component
-def create_logstics_cards(the_df, page_title):
+def create_logstics_cards(totals, page_title):
     div_class = {
         "class": "flex max-w-xs sm:max-w flex-col gap-y-4 border-2 border-blue-300 p-5 rounded-md bg-black transition "
                  "duration-300 ease-in-out hover:bg-gray-900"
@@ -1250,7 +1718,7 @@ def create_logstics_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        f'${the_df.groupby("Order_ID")["Sales"].sum().mean():,.0f}'
+                        f'${totals.avg_sales:,.0f}'
                     )
                 ),
 
@@ -1261,7 +1729,7 @@ def create_logstics_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        f'${the_df.groupby("Order_ID")["Profit"].sum().mean():,.0f}'
+                        f'${totals.avg_profit:,.0f}'
                     )
                 ),
 
@@ -1272,7 +1740,7 @@ def create_logstics_cards(the_df, page_title):
                     ),
                     html.dd(
                         dd_class,
-                        f'{the_df["Order_ID"].nunique():,.0f}'
+                        f'{totals.orders:,.0f}'
 
                     )
                 )
@@ -1284,10 +1752,7 @@ def create_logstics_cards(the_df, page_title):
     return cards
 
 
-def category_subcategory_quantity(the_df):
-    category_subcategoty = the_df.groupby(
-        ["Category", "Sub_Category"], as_index=False)["Quantity"].sum()
-
+def category_subcategory_quantity(category_subcategoty):
     fig = px.sunburst(category_subcategoty, path=["Category", "Sub_Category"],
                       values='Quantity',
                       color_discrete_sequence=[
@@ -1324,30 +1789,126 @@ def category_subcategory_quantity(the_df):
     return fig
 
 
-def year_over_year_chart(the_df):
-    year_over_year = the_df.groupby("Order_Year", as_index=False)[
-        "Profit"].sum()
+def year_over_year_chart(year_over_year):
+    return create_growth_chart(year_over_year, "year", "The Year-Over-Year Growth", height=565)
 
-    year_over_year["Prev_Year"] = 0
 
-    year_over_year.loc[1:,
-                       "Prev_Year"] = year_over_year.loc[0:2, "Profit"].tolist()
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def category_subcategory_figure(the_key):
+    ategory_subcategory = category_subcategory_quantity(
+        category_subcategory(the_key))
+    return figure_json(ategory_subcategory)
 
-    year_over_year["Yoy_Growth"] = round(
-        ((year_over_year["Profit"] - year_over_year["Prev_Year"]) / year_over_year["Prev_Year"]) * 100, 2)
 
-    year_over_year.replace(np.inf, 0, inplace=True)
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def year_over_year_figure(the_key):
+    # Year Over Year Growth
+    year_over_year = year_over_year_chart(year_over_year_growth(the_key))
+    return figure_json(year_over_year)
 
-    fig = px.line(year_over_year, x=year_over_year["Order_Year"].astype(str), y="Yoy_Growth",
-                  template="plotly_dark",
-                  labels={
-                      "Yoy_Growth": "Year-Over-Year Profit Growth (%)", "x": "Year"},
-                  color_discrete_sequence=[
-                  "#ADA2FF", "#C0DEFF", "#FCDDB0", "#FF0060", "#EDD2F3"],
-                  title="The Year-Over-Year Profit Growth",
-                  height=565,
-                  markers="o",
-                  )
+
+@component
+def create_logistics_charts(sunburst_figure, growth_figure):
+    div_class = {
+        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
+    }
+
+    chart = html.section(
+        {"class": "text-black py-2 sm:py-3"},
+        html.div(
+            {"class": "mx-auto max-w-7xl px-6 lg:px-8"},
+            html.dl(
+                {"class": "grid grid-cols-2 xs:grid-cols-1 sm:grid-cols-1 gap-x-1 gap-y-2 text-center lg:grid-cols-2"},
+                html.div(
+                    div_class,
+                    plotly_chart(sunburst_figure)
+                ),
+
+                html.div(
+                    div_class,
+                    plotly_chart(growth_figure)
+
+                ),
+
+            )
+        ),
+    )
+    return chart
+
+
+@component
+def create_lead_time_cards(stats):
+    div_class = {
+        "class": "flex max-w-xs sm:max-w flex-col gap-y-4 border-2 border-blue-300 p-5 rounded-md bg-black transition "
+                 "duration-300 ease-in-out hover:bg-gray-900"
+    }
+
+    dt_class = {
+        "class": "ext-base leading-7 text-white font-tahoma font-bold"
+    }
+
+    dd_class = {
+        "class": "order-first text-3xl font-tahoma font-bold tracking-tight text-white sm:text-3xl"
+    }
+
+    cards = html.section(
+        {"class": "text-black py-2 sm:py-2"},
+        html.div(
+            {"class": "mx-auto max-w-7xl px-6 lg:px-8"},
+            html.dl(
+                {"class": "grid grid-cols-3 xs:grid-cols-1 gap-x-8 gap-y-16 text-center lg:grid-cols-3"},
+                html.div(
+                    div_class,
+                    html.dt(
+                        dt_class, "AVG Shipping Lead Time"
+                    ),
+                    html.dd(
+                        dd_class,
+                        f'{stats.mean:,.1f} Days'
+                    )
+                ),
+
+                html.div(
+                    div_class,
+                    html.dt(
+                        dt_class, "Median Lead Time"
+                    ),
+                    html.dd(
+                        dd_class,
+                        f'{stats.median:,.0f} Days'
+                    )
+                ),
+
+                html.div(
+                    div_class,
+                    html.dt(
+                        dt_class, "90% Of Orders Ship Within"
+                    ),
+                    html.dd(
+                        dd_class,
+                        f'{stats.p90:,.0f} Days'
+                    )
+                )
+
+            )
+
+        ),
+    )
+    return cards
+
+
+def lead_time_histogram_chart(histogram):
+    the_data = histogram.reset_index().astype({"Lead_Days": str})
+    fig = px.bar(the_data, x="Lead_Days", y="Orders",
+                 template="plotly_dark",
+                 labels={"Lead_Days": "Lead Time (Days)"},
+                 color_discrete_sequence=["#ADA2FF"],
+                 text_auto="0.3s",
+                 title="Orders By Shipping Lead Time",
+                 height=500,
+                 )
 
     fig.update_layout(
         title={
@@ -1355,34 +1916,90 @@ def year_over_year_chart(the_df):
                 "size": 23,
                 "family": "tahoma"
             }
-        },        hoverlabel={
+        },
+        hoverlabel={
             "bgcolor": "#222",
             "font_size": 14,
             "font_family": "tahoma"
         })
     fig.update_traces(
-        hovertemplate="%{x}<br>YOY PCT: %{y}%",
-        marker_size=10)
+        textfont={
+            "family": "tahoma",
+            "size": 15,
+            "color": "white"
+        },
+        marker=dict(line=dict(color='#111', width=2)),
+        hovertemplate="Lead Time: <b>%{x} Days</b><br>Orders: %{y:,}")
 
     return fig
 
 
-@component
-def create_logistics_charts(the_df):
-    div_class = {
-        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
-    }
+def lead_time_by_chart(stats, xlabel, the_title, chart_type="bar"):
+    by = stats.index.name
+    the_data = stats.rename(columns={"mean": "Average", "median": "Median", "p90": "90th Percentile"})
+    the_data = the_data.reset_index().astype({by: str})
+    options = dict(data_frame=the_data, x=by, y=["Average", "Median", "90th Percentile"],
+                   template="plotly_dark",
+                   labels={by: xlabel, "value": "Lead Time (Days)", "variable": ""},
+                   color_discrete_sequence=["#ADA2FF", "#C0DEFF", "#FF9F9F"],
+                   title=the_title,
+                   height=500)
+    if chart_type == "line":
+        fig = px.line(markers="o", **options)
+    else:
+        fig = px.bar(barmode="group", **options)
 
-    ategory_subcategory = category_subcategory_quantity(the_df)
+    fig.update_layout(
+        title={
+            "font": {
+                "size": 23,
+                "family": "tahoma"
+            }
+        },
+        hoverlabel={
+            "bgcolor": "#222",
+            "font_size": 14,
+            "font_family": "tahoma"
+        })
+    fig.update_traces(
+        hovertemplate=xlabel + ": <b>%{x}</b><br>%{fullData.name}: %{y:.1f} Days")
 
-    fig_ategory_subcategory = ategory_subcategory.to_html(include_plotlyjs='cdn', config={
-        'displayModeBar': False})
+    return fig
 
-    # Year Over Year Growth
-    year_over_year_growth = year_over_year_chart(the_df)
 
-    fig_year_over_year_growth = year_over_year_growth.to_html(include_plotlyjs='cdn', config={
-        'displayModeBar': False})
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def lead_time_histogram_figure(the_key):
+    return figure_json(lead_time_histogram_chart(lead_time_histogram(the_key)))
+
+
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def lead_time_ship_mode_figure(the_key):
+    return figure_json(lead_time_by_chart(lead_time_by(the_key, "Ship_Mode"), "Ship Mode",
+                                          "Lead Time Via Shipping Mode"))
+
+
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def lead_time_region_figure(the_key):
+    return figure_json(lead_time_by_chart(lead_time_by(the_key, "Region"), "Region",
+                                          "Lead Time Via Regions"))
+
+
+@figure_cache.memoize
+@timed(FIGURE_SECONDS)
+def lead_time_month_figure(the_key):
+    via_month = lead_time_by(the_key, "Order_Month").rename(index=lambda month: month[:3])
+    return figure_json(lead_time_by_chart(via_month, "Month", "Lead Time Via Month",
+                                          chart_type="line"))
+
+
+@component
+def create_lead_time_charts(histogram_figure, ship_mode_figure, region_figure, month_figure):
+    div_class = {
+        "class": "flex max-auto flex-col gap-y-1 border-1 border-gray-800 p-2 rounded-md bg-black"
+    }
 
     chart = html.section(
         {"class": "text-black py-2 sm:py-3"},
@@ -1392,13 +2009,22 @@ def create_logistics_charts(the_df):
                 {"class": "grid grid-cols-2 xs:grid-cols-1 sm:grid-cols-1 gap-x-1 gap-y-2 text-center lg:grid-cols-2"},
                 html.div(
                     div_class,
-                    utils.html_to_vdom(fig_ategory_subcategory)
+                    plotly_chart(histogram_figure)
                 ),
 
                 html.div(
                     div_class,
-                    utils.html_to_vdom(fig_year_over_year_growth)
+                    plotly_chart(ship_mode_figure)
+                ),
+
+                html.div(
+                    div_class,
+                    plotly_chart(region_figure)
+                ),
 
+                html.div(
+                    div_class,
+                    plotly_chart(month_figure)
                 ),
 
             )
@@ -1408,24 +2034,156 @@ def create_logistics_charts(the_df):
 # ==================== End Locations Page Components =======================
 
 
-@component
-def home():
-    if form_data["state"] == "All":
-        dff = df.copy()
+# Independent cards and charts of every page, computed concurrently
+page_scheduler = PageScheduler(compute_pool, {
+    "home": {
+        "totals": home_totals,
+        "regions": regions_sales_figure,
+        "segments": segments_sales_figure,
+    },
+    "locations": {
+        "totals": locations_totals,
+        "top_10_states": top_10_state_figure,
+    },
+    "customers": {
+        "totals": customers_totals,
+        "via_years": customers_via_years_figure,
+        "segment": customers_segment_figure,
+    },
+    "time_series": {
+        "sales": slaes_via_months_figure,
+        "profit": profit_via_months_figure,
+    },
+    "logistics": {
+        "totals": logistics_totals,
+        "category_subcategory": category_subcategory_figure,
+        "year_over_year": year_over_year_figure,
+        "lead_times": lead_time_totals,
+        "lead_histogram": lead_time_histogram_figure,
+        "lead_ship_mode": lead_time_ship_mode_figure,
+        "lead_region": lead_time_region_figure,
+        "lead_month": lead_time_month_figure,
+    },
+})
+
+
+# Optional background warm-up of every filter combination, started from the
+# app lifespan when DASHBOARD_WARMUP=1. With DASHBOARD_WARMUP_FIGURES=1 the
+# serialized figures are precomputed too. Only the most requested keys that
+# fit in the caches are warmed; raise DASHBOARD_CACHE_SIZE (and
+# DASHBOARD_FIGURE_CACHE_SIZE) to warm more of them.
+# It fills this process's caches, so it helps the inline and thread compute
+# modes; process workers keep caches of their own.
+def sales_via_year_month(the_key):
+    return measure_via_year_month(the_key, "Sales")
+
+
+def profit_via_year_month(the_key):
+    return measure_via_year_month(the_key, "Profit")
+
+
+def lead_time_by_dimensions(the_key):
+    return [lead_time_by(the_key, by) for by in LEAD_DIMENSIONS]
+
+
+def measures_via_periods(the_key):
+    return [measures_via_period(the_key, granularity) for granularity in GRANULARITIES]
+
+
+def period_growths(the_key):
+    return [period_growth(the_key, granularity, 1) for granularity in GRANULARITIES]
+
+
+warmup_functions = [
+    home_totals, regions_sales, segments_sales, locations_totals,
+    top_10_states_sales, customers_totals, customers_by_segment,
+    customers_via_years, logistics_totals, category_subcategory,
+    sales_via_year_month, profit_via_year_month,
+    lead_time_totals, lead_time_histogram, lead_time_by_dimensions,
+    measures_via_periods, period_growths,
+]
+if os.environ.get("DASHBOARD_WARMUP_FIGURES") == "1":
+    warmup_functions += [function for tasks in page_scheduler.pages.values()
+                         for function in tasks.values()]
+
+# keys are filled in by load_dataset()
+warmup = WarmUp(
+    warmup_functions,
+    [],
+    delay=float(os.environ.get("DASHBOARD_WARMUP_DELAY", 0.05)),
+    busy=lambda: page_scheduler.busy or compute_pool.busy,
+    caches=[aggregation_cache, figure_cache],
+)
 
-    else:
-        dff = df[df["State"] == form_data["state"]].copy()
 
-    if form_data["category"] == "All":
-        dff = dff.copy()
+@app.get("/_dashboard/warmup")
+def warmup_progress():
+    return warmup.progress()
+
+
+@app.get("/_dashboard/ready")
+def readiness():
+    # 503 until the dataset is loaded, with the startup-time report
+    return JSONResponse(startup.report(), status_code=200 if startup.ready else 503)
+
+
+@app.get("/_dashboard/pages")
+def page_timings():
+    return {"pages": page_scheduler.reports,
+            "renders": page_scheduler.stats()}
+
+
+# Prometheus metrics, with DASHBOARD_METRICS=1 (see metrics.py)
+if metrics.ENABLED:
+    @metrics.registry.collector
+    def dashboard_counters():
+        for name, cache in (("aggregations", aggregation_cache), ("figures", figure_cache)):
+            stats = cache.stats()
+            labels = {"cache": name}
+            yield "dashboard_cache_entries", "gauge", "Entries in the cache.", labels, stats["size"]
+            for counter in ("hits", "misses", "evictions", "expirations"):
+                yield (f"dashboard_cache_{counter}_total", "counter",
+                       f"Cache {counter}.", labels, stats[counter])
+
+        if row_store is not None:
+            partitions = row_store.stats()
+            yield ("dashboard_partitions_loaded", "gauge",
+                   "Data partitions in memory.", {}, partitions["loaded"])
+            yield ("dashboard_partitions_resident_bytes", "gauge",
+                   "Memory held by data partitions read from the snapshot.", {},
+                   partitions["resident_bytes"])
+            for counter in ("loads", "evictions"):
+                yield (f"dashboard_partition_{counter}_total", "counter",
+                       f"Data partition {counter}.", {}, partitions[counter])
+
+        renders = page_scheduler.stats()
+        yield ("dashboard_page_superseded_total", "counter",
+               "Page computations a session stopped waiting for.", {}, renders["superseded"])
+        yield ("dashboard_page_failed_total", "counter",
+               "Page computations that raised.", {}, renders["failed"])
+        yield ("dashboard_page_coalesced_total", "counter",
+               "Page requests served by a computation already in flight.", {},
+               renders["single_flight"]["coalesced"])
+
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
 
-    else:
-        dff = dff[dff["Category"] == form_data["category"]].copy()
 
-    if form_data["year"] == "All":
-        dff = dff.copy()
+@component
+def home():
+    form_data, set_form_data = use_filters()
+    the_key = filter_key(form_data)
+    page_data = use_computation(page_scheduler, "home", the_key)
+
+    if is_pending(page_data):
+        page_content = [pending_section(page_data)]
     else:
-        dff = dff[dff["Order_Year"] == int(form_data["year"])].copy()
+        page_content = [
+            create_home_cards(page_data["totals"], "Sales Dashboard"),
+            create_shipping_segment_chart(
+                page_data["regions"], page_data["segments"]),
+        ]
 
     sidebar = html.nav(
         {"style": {"background-color": "#121212",
@@ -1438,8 +2196,7 @@ def home():
                    "height": "100%", "width": "81%", "position": "relative", "margin-left": "19%"},
          "class": "fixed top-0 left-0 z-40 w-64 h-screen transition-transform -translate-x-full sm:translate-x-0"},
 
-        create_home_cards(dff, "Sales Dashboard"),
-        create_shipping_segment_chart(dff),
+        *page_content
     )
 
     return html.div(
@@ -1452,22 +2209,17 @@ def home():
 
 @component
 def locations():
-    if form_data["state"] == "All":
-        dff = df.copy()
-
-    else:
-        dff = df[df["State"] == form_data["state"]].copy()
-
-    if form_data["category"] == "All":
-        dff = dff.copy()
+    form_data, set_form_data = use_filters()
+    the_key = filter_key(form_data)
+    page_data = use_computation(page_scheduler, "locations", the_key)
 
+    if is_pending(page_data):
+        page_content = [pending_section(page_data)]
     else:
-        dff = dff[dff["Category"] == form_data["category"]].copy()
-
-    if form_data["year"] == "All":
-        dff = dff.copy()
-    else:
-        dff = dff[dff["Order_Year"] == int(form_data["year"])].copy()
+        page_content = [
+            create_locations_cards(page_data["totals"], "Locations"),
+            create_top_10_state_chart(page_data["top_10_states"]),
+        ]
 
     sidebar = html.nav(
         {"style": {"background-color": "#121212",
@@ -1480,8 +2232,7 @@ def locations():
                    "height": "100%", "width": "81%", "position": "relative", "margin-left": "19%"},
          "class": "fixed top-0 left-0 z-40 w-64 h-screen transition-transform -translate-x-full sm:translate-x-0"},
 
-        create_locations_cards(dff, "Locations"),
-        create_top_10_state_chart(dff),
+        *page_content
     )
 
     return html.section(
@@ -1494,22 +2245,18 @@ def locations():
 
 @component
 def customers():
-    if form_data["state"] == "All":
-        dff = df.copy()
-
-    else:
-        dff = df[df["State"] == form_data["state"]].copy()
-
-    if form_data["category"] == "All":
-        dff = dff.copy()
-
-    else:
-        dff = dff[dff["Category"] == form_data["category"]].copy()
+    form_data, set_form_data = use_filters()
+    the_key = filter_key(form_data)
+    page_data = use_computation(page_scheduler, "customers", the_key)
 
-    if form_data["year"] == "All":
-        dff = dff.copy()
+    if is_pending(page_data):
+        page_content = [pending_section(page_data)]
     else:
-        dff = dff[dff["Order_Year"] == int(form_data["year"])].copy()
+        page_content = [
+            create_customers_cards(page_data["totals"], "Customers"),
+            create_customers_charts(
+                page_data["via_years"], page_data["segment"]),
+        ]
 
     sidebar = html.nav(
         {"style": {"background-color": "#121212",
@@ -1522,8 +2269,7 @@ def customers():
                    "height": "100%", "width": "81%", "position": "relative", "margin-left": "19%"},
          "class": "fixed top-0 left-0 z-40 w-64 h-screen transition-transform -translate-x-full sm:translate-x-0"},
 
-        create_customers_cards(dff, "Customers"),
-        create_customers_charts(dff),
+        *page_content
     )
 
     return html.section(
@@ -1536,22 +2282,26 @@ def customers():
 
 @component
 def time_series():
-    if form_data["state"] == "All":
-        dff = df.copy()
-
-    else:
-        dff = df[df["State"] == form_data["state"]].copy()
-
-    if form_data["category"] == "All":
-        dff = dff.copy()
-
-    else:
-        dff = dff[dff["Category"] == form_data["category"]].copy()
-
-    if form_data["year"] == "All":
-        dff = dff.copy()
+    form_data, set_form_data = use_filters()
+    the_key = filter_key(form_data)
+    page_data = use_computation(page_scheduler, "time_series", the_key)
+    # answered from the time rollups, separately from the page's charts
+    granularity, set_granularity = use_state("month")
+    timeline = use_computation(compute_pool, timeline_figure, the_key, granularity)
+    growth = use_computation(compute_pool, timeline_growth_figure, the_key, granularity)
+
+    if is_pending(page_data):
+        page_content = [pending_section(page_data)]
     else:
-        dff = dff[dff["Order_Year"] == int(form_data["year"])].copy()
+        page_content = [
+            create_slaes_via_months_charts(page_data["sales"]),
+            create_profit_via_months_charts(page_data["profit"]),
+        ]
+    page_content += [
+        granularity_menu(granularity, set_granularity),
+        pending_section(timeline) if is_pending(timeline) else create_timeline_charts(timeline),
+        pending_section(growth) if is_pending(growth) else create_timeline_charts(growth),
+    ]
 
     sidebar = html.nav(
         {"style": {"background-color": "#121212",
@@ -1565,8 +2315,7 @@ def time_series():
          "class": "fixed top-0 left-0 z-40 w-64 h-screen transition-transform -translate-x-full sm:translate-x-0"},
 
         page_header("Time Series"),
-        create_slaes_via_months_charts(dff),
-        create_profit_via_months_charts(dff)
+        *page_content
     )
 
     return html.section(
@@ -1579,22 +2328,22 @@ def time_series():
 
 @component
 def logistics():
-    if form_data["state"] == "All":
-        dff = df.copy()
-
-    else:
-        dff = df[df["State"] == form_data["state"]].copy()
-
-    if form_data["category"] == "All":
-        dff = dff.copy()
-
-    else:
-        dff = dff[dff["Category"] == form_data["category"]].copy()
+    form_data, set_form_data = use_filters()
+    the_key = filter_key(form_data)
+    page_data = use_computation(page_scheduler, "logistics", the_key)
 
-    if form_data["year"] == "All":
-        dff = dff.copy()
+    if is_pending(page_data):
+        page_content = [pending_section(page_data)]
     else:
-        dff = dff[dff["Order_Year"] == int(form_data["year"])].copy()
+        page_content = [
+            create_logstics_cards(page_data["totals"], "Logistics"),
+            create_logistics_charts(
+                page_data["category_subcategory"], page_data["year_over_year"]),
+            create_lead_time_cards(page_data["lead_times"]),
+            create_lead_time_charts(
+                page_data["lead_histogram"], page_data["lead_ship_mode"],
+                page_data["lead_region"], page_data["lead_month"]),
+        ]
 
     sidebar = html.nav(
         {"style": {"background-color": "#121212",
@@ -1607,8 +2356,7 @@ def logistics():
                    "height": "100%", "width": "81%", "position": "relative", "margin-left": "19%"},
          "class": "fixed top-0 left-0 z-40 w-64 h-screen transition-transform -translate-x-full sm:translate-x-0"},
 
-        create_logstics_cards(dff, "Logistics"),
-        create_logistics_charts(dff),
+        *page_content
     )
 
     return html.section(
@@ -1619,28 +2367,61 @@ def logistics():
     )
 
 
+class LazyPageResolver(SimpleResolver):
+    # Route elements are page functions rather than page instances, so only
+    # the page matching the current path is ever created and rendered.
+    def resolve(self, path):
+        match = super().resolve(path)
+        if match is None:
+            return None
+        page, params = match
+        return page(key=self.key), params
+
+
+lazy_router = create_router(LazyPageResolver)
+
+page_routes = (
+    route("/", home),
+    route("/locations", locations),
+    route("/customers", customers),
+    route("/TimeSeries", time_series),
+    route("/Logistics", logistics),
+)
+
+
+def use_startup():
+    # re-renders once the dataset is loaded, or failed to load
+    done, set_done = use_state(startup.done)
+
+    @use_effect(dependencies=[])
+    async def wait_for_dataset():
+        if not done:
+            await startup.wait()
+            set_done(True)
+
+
 @component
 def App():
-    return simple.router(
-        route("/", home()),
-        route("/locations", locations()),
-        route("/customers", customers()),
-        route("/TimeSeries", time_series()),
-        route("/Logistics", logistics()),
-    )
+    use_startup()
+    if not startup.ready:
+        return pending_section(startup.error or PENDING)
+    return filters_provider(lazy_router(*page_routes))
 
 
 # Create the app
+assets = AssetRegistry()
+assets.mount(app)
+
 configure(app, App, Options(head=html.head(
     html.link(
         {
             'rel': 'stylesheet',
-            'href': 'https://unpkg.com/tailwindcss@^1.0/dist/tailwind.min.css',
+            'href': assets.url("tailwind.min.css"),
         }
     ),
     html.script(
         {
-            'src': "https://cdn.plot.ly/plotly-latest.min.js",
+            'src': assets.url("plotly.min.js"),
 
         }
     ),
@@ -1649,5 +2430,7 @@ configure(app, App, Options(head=html.head(
 )
 )
 
+startup.record("app", _app_started)
+
 # if __name__ == "__main__":
 #     app.run()
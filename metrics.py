@@ -0,0 +1,203 @@
+"""Opt-in render and computation timings, exposed in the Prometheus text format.
+
+Enabled with DASHBOARD_METRICS=1; otherwise the decorators return the
+function untouched and nothing is recorded. Only work done in this process
+is seen: with DASHBOARD_COMPUTE=process the aggregations and figures run in
+worker processes and are missing from the histograms.
+"""
+import bisect
+import contextlib
+import contextvars
+import functools
+import os
+import threading
+import time
+
+import reactpy
+
+ENABLED = os.environ.get("DASHBOARD_METRICS") == "1"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+NODES_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label value combination."""
+
+    def __init__(self, name, documentation, labelnames, buckets=SECONDS_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                # per bucket counts (last one is +Inf), then sum
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(counts), total)
+                            for labels, (counts, total) in self._series.items())
+        for labelvalues, counts, total in series:
+            labels = dict(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bucket_labels = format_labels(dict(labels, le=format_value(bound)))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.histograms = []
+        self.collectors = []
+
+    def histogram(self, name, documentation, labelnames, buckets=SECONDS_BUCKETS):
+        histogram = Histogram(name, documentation, labelnames, buckets)
+        self.histograms.append(histogram)
+        return histogram
+
+    def collector(self, function):
+        # function() yields (name, type, help, labels, value) samples of
+        # counters and gauges read at scrape time, e.g. cache statistics
+        self.collectors.append(function)
+        return function
+
+    def render(self):
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+
+        families = {}
+        for function in self.collectors:
+            for name, kind, documentation, labels, value in function():
+                family = families.setdefault(name, (kind, documentation, []))
+                family[2].append(f"{name}{format_labels(labels)} {format_value(value)}")
+        for name, (kind, documentation, samples) in families.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+COMPONENT_SECONDS = registry.histogram(
+    "dashboard_component_render_seconds",
+    "Wall time of one component render, children components excluded.", ("component",))
+COMPONENT_VDOM_NODES = registry.histogram(
+    "dashboard_component_vdom_nodes",
+    "VDOM elements returned by one component render.", ("component",), NODES_BUCKETS)
+AGGREGATION_SECONDS = registry.histogram(
+    "dashboard_aggregation_seconds",
+    "Wall time of a pandas aggregation (cache misses only).", ("function",))
+FIGURE_SECONDS = registry.histogram(
+    "dashboard_figure_seconds",
+    "Wall time of building and serializing a figure (cache misses only).", ("figure",))
+SERIALIZE_SECONDS = registry.histogram(
+    "dashboard_figure_serialize_seconds",
+    "Wall time of serializing a figure to JSON.", ("figure",))
+PAGE_SECONDS = registry.histogram(
+    "dashboard_page_seconds",
+    "Wall time of computing all the cards and charts of a page.", ("page",))
+PAGE_TASK_SECONDS = registry.histogram(
+    "dashboard_page_task_seconds",
+    "Wall time of one card or chart computation of a page.", ("page", "task"))
+
+
+# name of the innermost timed() function, labels the timing() blocks inside it
+_current = contextvars.ContextVar("dashboard_metrics_current", default="unknown")
+
+
+def timed(histogram):
+    """Decorator observing the wall time of each call in ``histogram``,
+    labelled with the function name."""
+    def decorator(function):
+        if not ENABLED:
+            return function
+        name = function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            token = _current.set(name)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, name)
+                _current.reset(token)
+
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def timing(histogram):
+    if not ENABLED:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - started, _current.get())
+
+
+def observe(histogram, value, *labelvalues):
+    if ENABLED:
+        histogram.observe(value, *labelvalues)
+
+
+def vdom_nodes(model):
+    if isinstance(model, dict):
+        return 1 + sum(vdom_nodes(child) for child in model.get("children", ()))
+    if isinstance(model, (list, tuple)):
+        return sum(vdom_nodes(child) for child in model)
+    # child components and text count as one node, they render on their own
+    return 1 if model is not None else 0
+
+
+def component(function):
+    """``reactpy.component`` that also records render time and VDOM size."""
+    if not ENABLED:
+        return reactpy.component(function)
+    name = function.__name__
+
+    @functools.wraps(function)
+    def render(*args, **kwargs):
+        started = time.perf_counter()
+        model = function(*args, **kwargs)
+        COMPONENT_SECONDS.observe(time.perf_counter() - started, name)
+        COMPONENT_VDOM_NODES.observe(vdom_nodes(model), name)
+        return model
+
+    return reactpy.component(render)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from filter_index import FilterIndex
+
+
+ORDER_ATTRIBUTES = ["Order_Date", "Ship_Date", "Lead_Days", "Ship_Mode",
+                    "Customer_ID", "State", "Region", "Order_Year", "Order_Month"]
+
+ORDER_MEASURES = ["Sales", "Profit", "Quantity"]
+
+
+def build_orders(the_df):
+    grouped = the_df.groupby("Order_ID", sort=False)
+    # an order has a single date, ship mode, customer and address
+    orders = grouped[ORDER_ATTRIBUTES].first()
+    orders[ORDER_MEASURES] = grouped[ORDER_MEASURES].sum()
+    orders["Lines"] = grouped.size()
+
+    # category mix: the measures and line count of each category's lines,
+    # as "<measure>_<category>" columns (zero when the order has none)
+    by_category = the_df.groupby(["Order_ID", "Category"], observed=True, sort=False)
+    mix = by_category[ORDER_MEASURES].sum()
+    mix["Lines"] = by_category.size()
+    # every category gets its columns, even without lines in the_df
+    mix = mix.unstack("Category", fill_value=0).reindex(columns=pd.MultiIndex.from_product(
+        [mix.columns, the_df["Category"].cat.categories]), fill_value=0)
+    mix.columns = [f"{measure}_{category}" for measure, category in mix.columns]
+    return orders.join(mix).reset_index()
+
+
+class OrderTable:
+    """One row per order: dates, lead days, ship mode, customer, state, region,
+    Sales/Profit/Quantity and line totals, and the same totals per category.
+
+    Built once per dataset version. Filters resolve through a FilterIndex on
+    the orders; the category filter keeps the orders with lines in that
+    category, and ``view`` then swaps in that category's totals so the
+    orders look like the filtered rows grouped by Order_ID.
+
+    Each data partition's orders (``piece``) are stacked by ``combine``; an
+    order is placed on a single date from a single address, so it never
+    spans partitions.
+    """
+
+    def __init__(self, orders, categories):
+        self.orders = orders
+        self.categories = categories
+        self.index = FilterIndex(
+            self.orders, columns={"state": "State", "year": "Order_Year"},
+            positions={"category": {
+                str(category): np.flatnonzero(self.orders[f"Lines_{category}"].to_numpy() > 0)
+                for category in self.categories}})
+
+    piece = staticmethod(build_orders)
+
+    @classmethod
+    def combine(cls, pieces):
+        orders = pd.concat(pieces, ignore_index=True)
+        return cls(orders, [column[len("Lines_"):] for column in orders.columns
+                            if column.startswith("Lines_")])
+
+    def __len__(self):
+        return len(self.orders)
+
+    def view(self, form_data):
+        orders = self.index.view(form_data)
+        category = form_data.get("category", "All")
+        if category == "All":
+            return orders
+        return orders.assign(**{column: orders[f"{column}_{category}"]
+                                for column in ORDER_MEASURES + ["Lines"]})
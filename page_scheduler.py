@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import threading
+import time
+
+from metrics import PAGE_SECONDS, PAGE_TASK_SECONDS, observe
+from single_flight import SingleFlight
+
+logger = logging.getLogger("dashboard.pages")
+
+
+class PageScheduler:
+    """Computes the independent cards and charts of a page concurrently.
+
+    ``pages`` maps a page name to ``{task name: function(the_key)}``. Each
+    task goes through the compute pool on its own, so a page costs about as
+    much as its slowest chart. Per-task and end-to-end latencies of the last
+    computation of every page are kept in ``reports``.
+
+    Sessions asking for the same page, filters and dataset ``version`` at the
+    same time share one computation. A session whose filters change before
+    its page arrives stops waiting (counted in ``superseded``); work that no
+    other session waits for is then cancelled, see ``stats()``.
+    """
+
+    def __init__(self, pool, pages, version=None):
+        self.pool = pool
+        self.pages = pages
+        self.version = version
+        self.reports = {}
+        self.flights = SingleFlight()
+        self.superseded = 0
+        self.failed = 0
+        # run_sync calls in progress, they don't go through flights
+        self.running = 0
+        self._running_lock = threading.Lock()
+
+    @property
+    def inline(self):
+        return self.pool.inline
+
+    @property
+    def busy(self):
+        # a page is being computed for a session
+        return self.running > 0 or len(self.flights) > 0
+
+    def report(self, page, the_key, total, timings):
+        self.reports[page] = {
+            "filters": list(the_key),
+            "total": round(total, 4),
+            "tasks": {name: round(seconds, 4) for name, seconds in timings.items()},
+        }
+        observe(PAGE_SECONDS, total, page)
+        for name, seconds in timings.items():
+            observe(PAGE_TASK_SECONDS, seconds, page, name)
+        slowest = max(timings, key=timings.get) if timings else None
+        logger.info("%s %s computed in %.3fs (slowest: %s %.3fs)", page, the_key,
+                    total, slowest, timings.get(slowest, 0.0))
+
+    def run_sync(self, page, the_key):
+        started = time.perf_counter()
+        results, timings = {}, {}
+        with self._running_lock:
+            self.running += 1
+        try:
+            for name, function in self.pages[page].items():
+                task_started = time.perf_counter()
+                results[name] = function(the_key)
+                timings[name] = time.perf_counter() - task_started
+        finally:
+            with self._running_lock:
+                self.running -= 1
+        self.report(page, the_key, time.perf_counter() - started, timings)
+        return results
+
+    async def run(self, page, the_key):
+        try:
+            return await self.flights.do(
+                (page, the_key, self.version), self.compute, page, the_key)
+        except asyncio.CancelledError:
+            self.superseded += 1
+            raise
+
+    async def compute(self, page, the_key):
+        started = time.perf_counter()
+
+        async def timed(function):
+            task_started = time.perf_counter()
+            value = await self.pool.run(function, the_key)
+            return value, time.perf_counter() - task_started
+
+        tasks = self.pages[page]
+        try:
+            done = await asyncio.gather(*(timed(function) for function in tasks.values()))
+        except Exception:
+            self.failed += 1
+            logger.exception("%s %s failed", page, the_key)
+            raise
+
+        results = {name: value for name, (value, _) in zip(tasks, done)}
+        timings = {name: seconds for name, (_, seconds) in zip(tasks, done)}
+        self.report(page, the_key, time.perf_counter() - started, timings)
+        return results
+
+    def stats(self):
+        return {"superseded": self.superseded, "failed": self.failed,
+                "single_flight": self.flights.stats(),
+                "compute": self.pool.stats()}
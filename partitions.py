@@ -0,0 +1,118 @@
+import collections
+import threading
+
+import pandas as pd
+
+from filter_index import FILTER_COLUMNS, FilterIndex
+from schema import frame_memory
+
+
+def split_partitions(the_df, by):
+    """Yield a (description, frame) pair per combination of ``by`` values.
+
+    The description holds the partition ``key``, its ``rows`` and ``bytes``,
+    and the ``values`` each filter column takes in it, so a filter can skip
+    the partitions it cannot match without reading them. Frames keep the
+    row positions of the_df as their index.
+    """
+    for key, part in the_df.groupby(list(by), observed=True, sort=True):
+        yield {
+            # numpy scalars to plain values, the snapshot meta is JSON
+            "key": {column: value.item() if hasattr(value, "item") else value
+                    for column, value in zip(by, key)},
+            "rows": len(part),
+            "bytes": frame_memory(part),
+            "values": {name: sorted(str(value) for value in part[column].unique())
+                       for name, column in FILTER_COLUMNS.items()},
+        }, part
+
+
+class PartitionStore:
+    """Raw rows of the dataset, one frame per partition, read on first use.
+
+    ``partitions`` are descriptions from ``split_partitions`` that also say
+    where the rows are: the ``path`` of a Parquet file, or the ``frame``
+    itself when there is no snapshot to read it back from (those always stay
+    in memory). Partitions read from files are kept, least recently used
+    first out, while their total size stays within ``budget`` bytes (None:
+    no limit); an evicted one is read again the next time it is needed.
+    """
+
+    def __init__(self, partitions, budget=None):
+        self.partitions = partitions
+        self.budget = budget
+        self.resident = 0
+        self.loads = self.hits = self.evictions = 0
+        self._loaded = collections.OrderedDict()  # partition number -> FilterIndex
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(partition["rows"] for partition in self.partitions)
+
+    def select(self, form_data):
+        # numbers of the partitions that may hold rows matching form_data
+        return [number for number, partition in enumerate(self.partitions)
+                if all(form_data.get(key, "All") == "All"
+                       or str(form_data[key]) in partition["values"][key]
+                       for key in FILTER_COLUMNS)]
+
+    def load(self, number):
+        with self._lock:
+            index = self._loaded.get(number)
+            if index is not None:
+                self._loaded.move_to_end(number)
+                self.hits += 1
+                return index
+
+            partition = self.partitions[number]
+            if "frame" in partition:
+                index = FilterIndex(partition["frame"])
+            else:
+                index = FilterIndex(pd.read_parquet(partition["path"]))
+                self.loads += 1
+            self.keep(number, index)
+            return index
+
+    def keep(self, number, index):
+        # caller holds the lock, or nothing else uses the store yet
+        self._loaded[number] = index
+        if "frame" not in self.partitions[number]:
+            self.resident += self.partitions[number]["bytes"]
+        # the partition just loaded stays, even if it alone exceeds the budget
+        while (self.budget is not None and self.resident > self.budget
+               and len(self._loaded) > 1):
+            evicted, _ = self._loaded.popitem(last=False)
+            if "frame" not in self.partitions[evicted]:
+                self.resident -= self.partitions[evicted]["bytes"]
+                self.evictions += 1
+
+    def release(self):
+        # drop the partitions read from files, e.g. once the tables are built;
+        # rows() reads them again when needed
+        with self._lock:
+            for number in list(self._loaded):
+                if "frame" not in self.partitions[number]:
+                    del self._loaded[number]
+            self.resident = 0
+
+    def frames(self):
+        # every partition in turn, e.g. to build tables without holding the
+        # whole dataset in memory
+        for number in range(len(self.partitions)):
+            yield self.load(number).the_df
+
+    def rows(self, form_data):
+        """The rows matching form_data, in their order in the source file."""
+        numbers = self.select(form_data)
+        if not numbers:
+            return self.load(0).the_df.iloc[:0]
+        views = [self.load(number).view(form_data) for number in numbers]
+        if len(views) == 1:
+            return views[0]
+        return pd.concat(views).sort_index()
+
+    def stats(self):
+        with self._lock:
+            return {"partitions": len(self.partitions), "loaded": len(self._loaded),
+                    "resident_bytes": self.resident, "budget_bytes": self.budget,
+                    "loads": self.loads, "hits": self.hits, "evictions": self.evictions}
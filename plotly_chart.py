@@ -0,0 +1,25 @@
+import json
+from pathlib import Path
+
+from reactpy.web import export, module_from_file
+
+from metrics import SERIALIZE_SECONDS, timing
+
+_plotly_chart_module = module_from_file(
+    "dashboard-plotly-chart", Path(__file__).parent / "static" / "plotly_chart.js")
+_PlotlyChart = export(_plotly_chart_module, "PlotlyChart")
+
+
+def figure_json(fig):
+    # plotly's own encoder handles numpy arrays, dates and NaN
+    with timing(SERIALIZE_SECONDS):
+        return json.loads(fig.to_json())
+
+
+def plotly_chart(figure, config=None):
+    # figure is a plotly Figure or an already serialized figure_json() dict
+    if not isinstance(figure, dict):
+        figure = figure_json(figure)
+    if config is None:
+        config = {"displayModeBar": False}
+    return _PlotlyChart({"figure": figure, "config": config})
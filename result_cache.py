@@ -0,0 +1,94 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """Bounded LRU cache with an optional TTL for aggregation results.
+
+    Keys include ``version`` (the dataset version), so results computed from an
+    older dataset are never served; they simply age out.
+    """
+
+    def __init__(self, maxsize=512, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        # returns (found, value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key, value):
+        expires_at = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def entries_for(self, first_arg):
+        # current entries computed for that first argument, e.g. a filter key
+        with self._lock:
+            return sum(1 for _, version, args in self._entries
+                       if version == self.version and args[:1] == (first_arg,))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def memoize(self, function):
+        name = function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args):
+            key = (name, self.version, args)
+            found, value = self.get(key)
+            if found:
+                return value
+            value = function(*args)
+            self.set(key, value)
+            return value
+
+        wrapper.cache = self
+        return wrapper
@@ -0,0 +1,75 @@
+import pandas as pd
+
+from filter_index import FilterIndex
+
+
+ROLLUP_MEASURES = ["Sales", "Profit", "Quantity"]
+
+# granularity -> pandas period frequency (weeks run Monday to Sunday)
+GRANULARITIES = {"day": "D", "week": "W", "month": "M", "quarter": "Q", "year": "Y"}
+
+# granularity -> frequency of the period starts, to fill in missing periods
+PERIOD_STARTS = {"day": "D", "week": "W-MON", "month": "MS", "quarter": "QS", "year": "YS"}
+
+# named comparisons -> (granularity, periods back)
+COMPARISONS = {"yoy": ("year", 1), "qoq": ("quarter", 1), "mom": ("month", 1)}
+
+
+def build_daily(the_df):
+    return the_df.groupby(["State", "Category", "Order_Year", "Order_Date"],
+                          observed=True, sort=False)[ROLLUP_MEASURES].sum().reset_index()
+
+
+def build_rollup(daily, freq):
+    periods = daily["Order_Date"].dt.to_period(freq).dt.start_time.rename("Period")
+    grouped = daily.groupby(["State", "Category", "Order_Year", periods], observed=True)
+    return grouped[ROLLUP_MEASURES].sum().reset_index()
+
+
+class TimeRollups:
+    """Sales, Profit and Quantity per day, week, month, quarter and year.
+
+    Each level has one row per State, Category, Order_Year and period start
+    (``Period``), built once per dataset version from the daily totals and
+    sliced through its own FilterIndex. A week spanning New Year is split
+    by year, so a year filter only keeps that year's days.
+
+    The daily totals of each data partition (``piece``) are stacked by
+    ``combine``; a day falls in a single year, and a state in a single
+    region, so no day is split across partitions.
+    """
+
+    def __init__(self, daily):
+        self.levels = {granularity: FilterIndex(build_rollup(daily, freq))
+                       for granularity, freq in GRANULARITIES.items()}
+
+    piece = staticmethod(build_daily)
+
+    @classmethod
+    def combine(cls, pieces):
+        return cls(pd.concat(pieces, ignore_index=True))
+
+    def slice(self, form_data, granularity):
+        return self.levels[granularity].view(form_data)
+
+    def series(self, form_data, granularity, measures=ROLLUP_MEASURES):
+        # measures per period, in time order
+        return self.slice(form_data, granularity).groupby("Period")[measures].sum()
+
+    def growth(self, form_data, granularity, periods=1, measures=ROLLUP_MEASURES):
+        """Percent change of each measure against ``periods`` periods earlier,
+        e.g. ("month", 1) is month over month and ("month", 12) compares a
+        month with the same month a year before.
+
+        Periods without orders count as zero, so the comparison is always
+        with the calendar period. The change is relative to the size of the
+        earlier value (a loss shrinking is growth), and NaN without one.
+        """
+        totals = self.series(form_data, granularity, measures)
+        if len(totals):
+            totals = totals.reindex(pd.date_range(
+                totals.index[0], totals.index[-1], freq=PERIOD_STARTS[granularity],
+                name="Period"), fill_value=0)
+        previous = totals.shift(periods)
+        change = (totals - previous) / previous.abs() * 100
+        return change.where(previous != 0)
@@ -0,0 +1,41 @@
+import calendar
+
+import pandas as pd
+
+
+DIMENSION_COLUMNS = ["State", "City", "Region", "Category", "Sub_Category",
+                     "Segment", "Ship_Mode", "Country"]
+
+MONTH_NAMES = list(calendar.month_name)[1:]
+
+
+def frame_memory(the_df):
+    return int(the_df.memory_usage(deep=True).sum())
+
+
+def apply_schema(the_df):
+    """Turn the dimension columns into categoricals with stable codes.
+
+    Categories are sorted (months in calendar order), so the same values always
+    map to the same integer codes. The before/after memory footprint is kept in
+    ``the_df.attrs["schema_report"]``.
+    """
+    before = frame_memory(the_df)
+
+    for col in DIMENSION_COLUMNS:
+        the_df[col] = pd.Categorical(
+            the_df[col], categories=sorted(the_df[col].dropna().unique()))
+
+    the_df["Order_Month"] = pd.Categorical(
+        the_df["Order_Month"], categories=MONTH_NAMES, ordered=True)
+
+    the_df.attrs["schema_report"] = {
+        "before": before, "after": frame_memory(the_df)}
+    return the_df
+
+
+def format_memory_report(report):
+    saved = 1 - report["after"] / report["before"]
+    return (f'Dataset memory: {report["before"] / 2**20:,.1f} MiB -> '
+            f'{report["after"] / 2**20:,.1f} MiB ({saved:.0%} saved)')
+
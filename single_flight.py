@@ -0,0 +1,58 @@
+import asyncio
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one computation.
+
+    The first caller for a key starts the computation; callers arriving while
+    it runs await the same task. Waiters are shielded from each other: a
+    session that goes away cancels only its own wait. When the last waiter of
+    a key goes away the shared work is cancelled, nobody is left to use it.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._waiters = {}
+        self.started = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def do(self, key, function, *args):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(function(*args))
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                # later callers start afresh rather than join a dying task
+                if self._calls.get(key) is task:
+                    del self._calls[key]
+                task.cancel()
+                self.cancelled += 1
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _finish(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # mark the error as retrieved when every waiter already left
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        return {"in_flight": len(self._calls), "started": self.started,
+                "coalesced": self.coalesced, "cancelled": self.cancelled}
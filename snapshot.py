@@ -0,0 +1,221 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    import msvcrt
+    fcntl = None
+
+from filter_index import FilterIndex
+from partitions import PartitionStore, split_partitions
+
+logger = logging.getLogger("dashboard.snapshot")
+
+# snapshots need pyarrow, without it we always parse the CSV. Only looked up
+# here, pandas imports it when it reads or writes a snapshot.
+pyarrow = importlib.util.find_spec("pyarrow")
+
+
+SNAPSHOT_DIR = ".snapshot"
+
+# Bump whenever the layout of the snapshot files changes
+SNAPSHOT_FORMAT = 3
+
+
+def file_stat(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_paths(csv_path, snapshot_dir=None):
+    if snapshot_dir is None:
+        snapshot_dir = os.path.join(os.path.dirname(
+            os.path.abspath(csv_path)), SNAPSHOT_DIR)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return (os.path.join(snapshot_dir, name),
+            os.path.join(snapshot_dir, name + ".json"))
+
+
+def read_meta(meta_path):
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_meta(meta_path, meta):
+    # a temporary file of our own, other processes may be writing it too
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(meta_path),
+                                    prefix=os.path.basename(meta_path) + ".")
+    try:
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, meta_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def rebuild_lock(meta_path):
+    # one process rebuilds a snapshot at a time, the others wait for it
+    with open(meta_path + ".lock", "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # gave up after 10 seconds, keep waiting
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def partition_file(partition):
+    # e.g. "Order_Year=2016,Region=West.parquet"
+    return ",".join(f"{column}={value}" for column, value in partition["key"].items()) + ".parquet"
+
+
+def write_snapshot(parts, data_dir, meta_path, meta):
+    # one Parquet file per partition in data_dir, listed in the meta file.
+    # Written to a directory of our own first, then swapped in.
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(data_dir),
+                               prefix=os.path.basename(data_dir) + ".")
+    partitions = []
+    try:
+        for partition, frame in parts:
+            partition = dict(partition, file=partition_file(partition))
+            frame.to_parquet(os.path.join(tmp_dir, partition["file"]))
+            partitions.append(partition)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    shutil.rmtree(data_dir, ignore_errors=True)
+    os.replace(tmp_dir, data_dir)
+    if os.path.exists(data_dir + ".parquet"):
+        # format 1 kept all the rows in a single file
+        os.remove(data_dir + ".parquet")
+    # the meta file is written last, so a crash never pairs new meta with old data
+    meta = dict(meta, partitions=partitions)
+    write_meta(meta_path, meta)
+    return meta
+
+
+def current_meta(csv_path, stat, data_dir, meta_path, version, partition_by):
+    # the snapshot's meta if it still matches the CSV, else None
+    meta = read_meta(meta_path)
+    if (meta is None or meta.get("version") != version
+            or meta.get("format") != SNAPSHOT_FORMAT
+            or meta.get("partition_by") != partition_by
+            or not os.path.isdir(data_dir)):
+        return None
+    if meta["size"] == stat["size"] and meta["mtime_ns"] == stat["mtime_ns"]:
+        return meta
+
+    # Touched but maybe not modified (checkout, copy): compare contents
+    # before paying for a full rebuild.
+    if meta["size"] == stat["size"] and meta["sha256"] == file_hash(csv_path):
+        meta.update(stat)
+        try:
+            write_meta(meta_path, meta)
+        except OSError:
+            # read-only: the next start compares the contents again
+            pass
+        return meta
+    return None
+
+
+def open_snapshot(data_dir, meta, budget):
+    return PartitionStore([dict(partition, path=os.path.join(data_dir, partition["file"]))
+                           for partition in meta["partitions"]], budget)
+
+
+def memory_store(csv_path, the_df, stat, version, partition_by):
+    # no snapshot to read the partitions back from, they stay in memory
+    meta = dict(stat, version=version, sha256=file_hash(csv_path),
+                rows=len(the_df), source="csv", attrs=the_df.attrs)
+    return PartitionStore([dict(partition, frame=frame) for partition, frame
+                           in split_partitions(the_df, partition_by)]), meta
+
+
+def load_snapshot(csv_path, build, version=1, snapshot_dir=None,
+                  partition_by=("Order_Year",), budget=None):
+    """Open the enriched rows of ``csv_path`` from its Parquet snapshot.
+
+    The snapshot holds one file per combination of ``partition_by`` values.
+    ``build(csv_path)`` parses and enriches the CSV. It only runs when there is
+    no snapshot yet, or when the CSV (size, mtime, then content hash), the
+    snapshot ``version`` or ``partition_by`` changed; processes starting
+    together rebuild it once, the others wait and open it. Without pyarrow,
+    or when the snapshot cannot be written (e.g. a read-only directory), the
+    rows are built and kept in memory. Returns a PartitionStore
+    reading the partitions on demand within ``budget`` bytes, and the snapshot
+    metadata, whose ``sha256`` identifies the dataset version and whose
+    ``attrs`` are those of the built frame.
+    """
+    stat = file_stat(csv_path)
+    partition_by = list(partition_by)
+
+    if pyarrow is None:
+        return memory_store(csv_path, build(csv_path), stat, version, partition_by)
+
+    data_dir, meta_path = snapshot_paths(csv_path, snapshot_dir)
+    meta = current_meta(csv_path, stat, data_dir, meta_path, version, partition_by)
+    if meta is not None:
+        return open_snapshot(data_dir, meta, budget), dict(meta, source="snapshot")
+
+    the_df = None
+    try:
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        with rebuild_lock(meta_path):
+            # another process may have rebuilt it while this one waited
+            meta = current_meta(csv_path, stat, data_dir, meta_path, version, partition_by)
+            if meta is not None:
+                return open_snapshot(data_dir, meta, budget), dict(meta, source="snapshot")
+
+            the_df = build(csv_path)
+            # attrs (e.g. the schema report) are kept, a warm start has no frame
+            meta = dict(stat, version=version, format=SNAPSHOT_FORMAT,
+                        partition_by=partition_by, sha256=file_hash(csv_path),
+                        rows=len(the_df), attrs=the_df.attrs)
+            parts = list(split_partitions(the_df, partition_by))
+            meta = write_snapshot(parts, data_dir, meta_path, meta)
+    except OSError as error:
+        logger.warning("Cannot write the snapshot in %s (%s), keeping the rows in memory",
+                       os.path.dirname(meta_path), error)
+        if the_df is None:
+            the_df = build(csv_path)
+        return memory_store(csv_path, the_df, stat, version, partition_by)
+
+    # the partitions just built start out loaded, as far as the budget goes
+    store = open_snapshot(data_dir, meta, budget)
+    for number, (_, frame) in enumerate(parts):
+        store.keep(number, FilterIndex(frame))
+    return store, dict(meta, source="csv")
@@ -0,0 +1,113 @@
+"""Startup phases of the app, for the readiness endpoint and startup report."""
+import asyncio
+import contextlib
+import importlib
+import sys
+import threading
+import time
+import types
+
+
+_lazy_lock = threading.RLock()
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module in ``sys.modules`` until an attribute is used.
+
+    ``importlib.util.LazyLoader`` is not enough here: on Python 3.11 any later
+    ``import name`` elsewhere already triggers the real import.
+    """
+
+    def __getattr__(self, attr):
+        # only called for attributes not copied over yet
+        return getattr(self._load(), attr)
+
+    def _load(self):
+        with _lazy_lock:
+            module = self.__dict__.get("_module")
+            if module is None:
+                if sys.modules.get(self.__name__) is self:
+                    del sys.modules[self.__name__]
+                module = importlib.import_module(self.__name__)
+                self.__dict__.update(module.__dict__)
+                self.__dict__["_module"] = module
+            return module
+
+
+def lazy_import(name):
+    """Import ``name`` on first attribute access instead of now.
+
+    Modules importing ``name`` before that share the stand-in, so nothing pays
+    for the real import until it is used.
+    """
+    module = sys.modules.get(name)
+    if module is None:
+        module = sys.modules[name] = LazyModule(name)
+    return module
+
+
+class Startup:
+    """Times the startup phases and tracks when the dataset is ready.
+
+    ``started`` is when the main module began importing. ``imports`` and
+    ``app`` run at import time; the dataset phases run later, from the app
+    lifespan, while the server already accepts connections.
+    """
+
+    def __init__(self, started):
+        self.started = started
+        self.phases = {}
+        self.details = {}
+        self.ready_at = None
+        self.error = None
+        self._done = threading.Event()
+
+    def record(self, name, since):
+        # a phase that started at ``since`` and ends now; a phase that runs
+        # several times adds up
+        self.phases[name] = self.phases.get(name, 0) + time.perf_counter() - since
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started)
+
+    @property
+    def ready(self):
+        return self.ready_at is not None
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def set_ready(self):
+        self.ready_at = time.perf_counter()
+        self._done.set()
+
+    def set_failed(self, error):
+        self.error = error
+        self._done.set()
+
+    async def wait(self, interval=0.1):
+        # polled, the dataset loads on another thread
+        while not self._done.is_set():
+            await asyncio.sleep(interval)
+
+    def report(self):
+        return {
+            "ready": self.ready,
+            "error": repr(self.error) if self.error is not None else None,
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "details": self.details,
+            "ready_after": round(self.ready_at - self.started, 4) if self.ready else None,
+        }
+
+    def format_report(self):
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items())
+        details = "".join(f", {name}: {value}" for name, value in self.details.items())
+        if self.error is not None:
+            return f"Startup failed ({phases}{details}): {self.error!r}"
+        return f"Startup: {phases}{details}; ready {self.ready_at - self.started:.2f}s after import began"
@@ -0,0 +1,16 @@
+// ReactPy binding that draws a Plotly figure from its JSON dict.
+// Plotly.react diffs against the plot already in the node, so re-renders
+// patch the existing chart instead of rebuilding it.
+
+export function bind(node) {
+  return {
+    create: (type, props) => ({ type, props }),
+    render: (element) => element.type(node, element.props),
+    unmount: () => window.Plotly.purge(node),
+  };
+}
+
+export function PlotlyChart(node, props) {
+  const figure = props.figure;
+  window.Plotly.react(node, figure.data, figure.layout || {}, props.config || {});
+}
@@ -0,0 +1,70 @@
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_STORE = ROOT / "Sample_Store.csv"
+sys.path.insert(0, str(ROOT))
+
+# the bundled sample, computed inline in the test process
+os.environ["DASHBOARD_DATA_PATH"] = str(SAMPLE_STORE)
+os.environ["DASHBOARD_COMPUTE"] = "inline"
+
+
+@pytest.fixture(scope="session")
+def dashboard():
+    import main
+
+    main.load_dataset()
+    return main
+
+
+# (state, year, category) keys the tables are checked on against plain
+# pandas over the filtered rows: no filter, each filter, all three, a sparse
+# selection and one without rows
+FILTER_KEYS = [
+    ("All", "All", "All"),
+    ("California", "All", "All"),
+    ("All", "2016", "All"),
+    ("All", "All", "Technology"),
+    ("New York", "2017", "Office Supplies"),
+    ("Utah", "All", "Technology"),
+    ("Wyoming", "2015", "All"),
+]
+
+
+@pytest.fixture(scope="session")
+def sample_rows(dashboard):
+    # the enriched rows, read straight from the CSV
+    return dashboard.read_sample_store(str(SAMPLE_STORE))
+
+
+@pytest.fixture(params=FILTER_KEYS, ids="/".join)
+def the_key(request):
+    return request.param
+
+
+@pytest.fixture
+def form_data(the_key):
+    return dict(zip(("state", "year", "category"), the_key))
+
+
+def filter_rows(sample_rows, the_key):
+    # what the filter keeps, the plain pandas way
+    state, year, category = the_key
+    keep = pd.Series(True, index=sample_rows.index)
+    if state != "All":
+        keep &= sample_rows["State"] == state
+    if year != "All":
+        keep &= sample_rows["Order_Year"] == int(year)
+    if category != "All":
+        keep &= sample_rows["Category"] == category
+    return sample_rows[keep]
+
+
+@pytest.fixture
+def rows(sample_rows, the_key):
+    return filter_rows(sample_rows, the_key)
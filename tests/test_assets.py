@@ -0,0 +1,27 @@
+import pytest
+
+import assets
+
+
+def test_vendored_tailwind_covers_the_page_classes():
+    # fails after a page starts using a class: rerun `python assets.py`
+    assert set(assets.used_classes()) <= set(assets.vendored_classes())
+
+
+def test_purge_keeps_preflight_and_used_classes():
+    css = ("/*! banner */html{line-height:1.5}.p-2{padding:.5rem}.p-4{padding:1rem}"
+           ".hover\\:p-2:hover{padding:.5rem}.py-2\\.5{padding:.625rem 0}"
+           ".group:hover .group-hover\\:p-2{padding:.5rem}"
+           "@media (min-width:640px){.sm\\:p-2{padding:.5rem}.sm\\:p-4{padding:1rem}}"
+           "@media (min-width:768px){.md\\:p-4{padding:1rem}}")
+    assert assets.purge(css, ["p-2", "sm:p-2", "py-2.5", "group"]) == (
+        "/*! banner */html{line-height:1.5}.p-2{padding:.5rem}.py-2\\.5{padding:.625rem 0}"
+        "@media (min-width:640px){.sm\\:p-2{padding:.5rem}}")
+
+
+def test_registry_serves_local_files_only(tmp_path):
+    registry = assets.AssetRegistry()
+    assert all(url.startswith(assets.ASSETS_PREFIX + "/") for url in registry.urls.values())
+
+    with pytest.raises(FileNotFoundError):
+        assets.AssetRegistry({"missing.css": (tmp_path / "missing.css", "https://example.com")})
@@ -0,0 +1,14 @@
+import pandas as pd
+import pytest
+
+from cube import CUBE_DIMENSIONS, CUBE_MEASURES
+
+
+@pytest.mark.parametrize("dimension", CUBE_DIMENSIONS)
+def test_slice_sums_like_the_rows(dashboard, form_data, rows, dimension):
+    cells = dashboard.cube.slice(form_data)
+    expected = rows.groupby(dimension, observed=True)[CUBE_MEASURES].sum()
+    expected["Rows"] = rows.groupby(dimension, observed=True).size()
+    pd.testing.assert_frame_equal(
+        cells.groupby(dimension, observed=True)[[*CUBE_MEASURES, "Rows"]].sum(), expected,
+        check_dtype=False)
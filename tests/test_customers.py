@@ -0,0 +1,24 @@
+import pandas as pd
+
+
+def test_view_groups_the_rows_by_customer(dashboard, form_data, rows):
+    per_customer = rows.groupby("Customer_ID")
+    expected = pd.DataFrame({
+        "Customer_Name": per_customer["Customer_Name"].first(),
+        "Segment": per_customer["Segment"].first(),
+        "Orders": per_customer["Order_ID"].nunique(),
+        "Lines": per_customer.size(),
+        "Sales": per_customer["Sales"].sum(),
+        "Profit": per_customer["Profit"].sum(),
+        "First_Order_Date": per_customer["Order_Date"].min(),
+    })
+    customers = dashboard.customer_table.view(form_data)
+    # customers come in the order they first appear in the rows
+    assert customers.index.tolist() == rows["Customer_ID"].drop_duplicates().tolist()
+    pd.testing.assert_frame_equal(customers.sort_index(), expected, check_dtype=False,
+                                  check_categorical=False)
+
+
+def test_slice_counts_the_customers(dashboard, form_data, rows):
+    assert (dashboard.customer_table.slice(form_data)["Customer_ID"].nunique()
+            == rows["Customer_ID"].nunique())
@@ -0,0 +1,17 @@
+import filter_index
+from filter_index import filter_key, known_filter
+
+
+def test_only_known_filter_values_are_interned(dashboard):
+    state, year, category = (dashboard.state_list[1], dashboard.years_list[1],
+                             dashboard.category_list[1])
+    form_data = {"state": state, "year": year, "category": category}
+    assert known_filter(form_data)
+    assert filter_key(form_data) is filter_key(dict(form_data, year=str(year)))
+
+    interned = len(filter_index._interned_keys)
+    for number in range(100):
+        unknown = dict(form_data, state=f"Nowhere {number}")
+        assert not known_filter(unknown)
+        assert filter_key(unknown) == (f"Nowhere {number}", str(year), category)
+    assert len(filter_index._interned_keys) == interned
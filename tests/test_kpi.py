@@ -0,0 +1,40 @@
+import pytest
+
+
+def test_home_totals(dashboard, the_key, rows):
+    totals = dashboard.home_totals(the_key)
+    assert totals.sales == pytest.approx(rows["Sales"].sum())
+    assert totals.profit == pytest.approx(rows["Profit"].sum())
+    assert totals.quantity == rows["Quantity"].sum()
+    assert totals.customers == rows["Customer_ID"].nunique()
+
+
+def test_locations_totals(dashboard, the_key, rows):
+    if rows.empty:
+        pytest.skip("no top state without rows")
+    totals = dashboard.locations_totals(the_key)
+    assert totals.regions == rows["Region"].nunique()
+    assert totals.states == rows["State"].nunique()
+    rows_per_state = rows["State"].value_counts()
+    assert rows_per_state[totals.top_state] == rows_per_state.max()
+
+
+def test_customers_totals(dashboard, the_key, rows):
+    if rows.empty:
+        pytest.skip("no top customer without rows")
+    totals = dashboard.customers_totals(the_key)
+    per_customer = rows.groupby("Customer_ID")
+    assert totals.avg_sales == pytest.approx(per_customer["Sales"].sum().mean())
+    assert totals.avg_profit == pytest.approx(per_customer["Profit"].sum().mean())
+    orders = per_customer["Order_ID"].nunique()
+    top_loyal = set(rows.loc[rows["Customer_ID"].isin(orders[orders == orders.max()].index),
+                             "Customer_Name"])
+    assert totals.top_loyal in top_loyal
+
+
+def test_logistics_totals(dashboard, the_key, rows):
+    totals = dashboard.logistics_totals(the_key)
+    per_order = rows.groupby("Order_ID")
+    assert totals.orders == rows["Order_ID"].nunique()
+    assert totals.avg_sales == pytest.approx(per_order["Sales"].sum().mean(), nan_ok=True)
+    assert totals.avg_profit == pytest.approx(per_order["Profit"].sum().mean(), nan_ok=True)
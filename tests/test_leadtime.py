@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from leadtime import LEAD_DIMENSIONS, PERCENTILES
+
+
+def lead_days(rows):
+    # one lead time per order
+    return rows.groupby("Order_ID")["Lead_Days"].first()
+
+
+def expected_summary(days):
+    if days.empty:
+        return [0, np.nan, *(np.nan for _ in PERCENTILES)]
+    # nearest rank: the smallest lead time reached by that share of orders
+    return [len(days), days.mean(),
+            *(np.quantile(days, share, method="inverted_cdf") for share in PERCENTILES.values())]
+
+
+def test_summary(dashboard, form_data, rows):
+    summary = dashboard.lead_times.summary(form_data)
+    assert list(summary) == pytest.approx(expected_summary(lead_days(rows)), nan_ok=True)
+
+
+def test_histogram(dashboard, form_data, rows):
+    histogram = dashboard.lead_times.histogram(form_data)
+    expected = lead_days(rows).value_counts().sort_index()
+    assert histogram.to_dict() == expected.to_dict()
+
+
+@pytest.mark.parametrize("by", LEAD_DIMENSIONS)
+def test_summary_by(dashboard, form_data, rows, by):
+    summary = dashboard.lead_times.summary_by(form_data, by)
+    orders = rows.groupby("Order_ID")[[by, "Lead_Days"]].first()
+    assert set(summary.index) == set(orders[by])
+    for value, group in orders.groupby(by, observed=True):
+        assert list(summary.loc[value]) == pytest.approx(expected_summary(group["Lead_Days"]))
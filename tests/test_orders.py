@@ -0,0 +1,15 @@
+import pandas as pd
+
+from orders import ORDER_MEASURES
+
+
+def test_view_groups_the_rows_by_order(dashboard, form_data, rows):
+    per_order = rows.groupby("Order_ID")
+    expected = per_order[ORDER_MEASURES].sum()
+    expected["Lines"] = per_order.size()
+    expected["Lead_Days"] = per_order["Lead_Days"].first()
+    expected["Ship_Mode"] = per_order["Ship_Mode"].first()
+
+    orders = dashboard.order_table.view(form_data).set_index("Order_ID")
+    pd.testing.assert_frame_equal(orders[expected.columns].sort_index(), expected,
+                                  check_dtype=False, check_categorical=False)
@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+import snapshot
+from conftest import FILTER_KEYS, SAMPLE_STORE, filter_rows
+
+
+@pytest.mark.skipif(snapshot.pyarrow is None, reason="snapshots need pyarrow")
+def test_rows_within_a_small_budget(dashboard, sample_rows, tmp_path):
+    # room for about one of the four year partitions at a time
+    budget = sum(partition["bytes"] for partition in dashboard.row_store.partitions) // 3
+    store, _ = snapshot.load_snapshot(str(SAMPLE_STORE), dashboard.read_sample_store,
+                                      snapshot_dir=str(tmp_path), budget=budget)
+
+    # every key twice, so partitions are evicted and read back
+    for the_key in FILTER_KEYS * 2:
+        pd.testing.assert_frame_equal(store.rows(dashboard.filter_form(the_key)),
+                                      filter_rows(sample_rows, the_key))
+        stats = store.stats()
+        assert stats["resident_bytes"] <= budget
+    assert stats["evictions"] > 0
+    assert stats["loads"] > stats["partitions"]
+
+
+@pytest.mark.skipif(snapshot.pyarrow is None, reason="snapshots need pyarrow")
+def test_no_rows_stay_loaded_once_the_tables_are_built(dashboard, sample_rows):
+    assert dashboard.row_store.stats()["loaded"] == 0
+
+    the_key = ("All", "2016", "All")
+    pd.testing.assert_frame_equal(dashboard.row_store.rows(dashboard.filter_form(the_key)),
+                                  filter_rows(sample_rows, the_key))
+    dashboard.row_store.release()
+    assert dashboard.row_store.stats()["loaded"] == 0
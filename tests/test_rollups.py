@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from rollups import GRANULARITIES, ROLLUP_MEASURES
+
+
+def period_totals(rows, granularity):
+    periods = rows["Order_Date"].dt.to_period(GRANULARITIES[granularity])
+    return rows.groupby(periods)[ROLLUP_MEASURES].sum()
+
+
+@pytest.mark.parametrize("granularity", GRANULARITIES)
+def test_series(dashboard, form_data, rows, granularity):
+    series = dashboard.time_rollups.series(form_data, granularity)
+    expected = period_totals(rows, granularity)
+    expected.index = expected.index.start_time.rename("Period")
+    pd.testing.assert_frame_equal(series, expected, check_dtype=False, check_index_type=False,
+                                  check_freq=False)
+
+
+@pytest.mark.parametrize("granularity, periods", [
+    ("day", 1), ("week", 1), ("month", 1), ("month", 12), ("quarter", 1), ("year", 1)])
+def test_growth(dashboard, form_data, rows, granularity, periods):
+    growth = dashboard.time_rollups.growth(form_data, granularity, periods)
+    if rows.empty:
+        assert growth.empty
+        return
+
+    totals = period_totals(rows, granularity)
+    # every calendar period in between, those without orders at zero
+    totals = totals.reindex(pd.period_range(totals.index.min(), totals.index.max(),
+                                            freq=GRANULARITIES[granularity]), fill_value=0)
+    previous = totals.shift(periods)
+    expected = ((totals - previous) / previous.abs() * 100).where(previous != 0)
+    expected.index = expected.index.start_time.rename("Period")
+    pd.testing.assert_frame_equal(growth, expected, check_freq=False)
+
+
+def test_growth_across_missing_periods(dashboard):
+    # Utah's technology orders, months apart
+    form_data = {"state": "Utah", "year": "All", "category": "Technology"}
+    months = dashboard.time_rollups.series(form_data, "month").index
+    sales = dashboard.time_rollups.growth(form_data, "month")["Sales"]
+    after_orders = (sales.index - pd.DateOffset(months=1)).isin(months)
+
+    # orders stopping is -100%, and nothing compares with a month without any
+    stopped = sales[after_orders & ~sales.index.isin(months)]
+    assert len(stopped) and (stopped == -100).all()
+    assert (~after_orders).sum() and sales[~after_orders].isna().all()
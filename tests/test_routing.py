@@ -0,0 +1,51 @@
+import asyncio
+from collections import Counter
+
+import pytest
+from reactpy.backend.hooks import ConnectionContext
+from reactpy.backend.types import Connection, Location
+from reactpy.core.layout import Layout
+
+
+# aggregation functions each page computes, and no other
+PAGE_AGGREGATIONS = {
+    "/": {"home_totals", "regions_sales", "segments_sales"},
+    "/locations": {"locations_totals", "top_10_states_sales"},
+    "/customers": {"customers_totals", "customers_by_segment", "customers_via_years"},
+    "/TimeSeries": {"measure_via_year_month", "measures_via_period", "period_growth"},
+    "/Logistics": {"logistics_totals", "category_subcategory", "period_growth",
+                   "lead_time_totals", "lead_time_histogram", "lead_time_by"},
+}
+
+
+def render(main, path):
+    connection = Connection(scope={}, location=Location(path, ""), carrier=None)
+
+    async def first_render():
+        async with Layout(ConnectionContext(main.App(), value=connection)) as layout:
+            return await layout.render()
+
+    return asyncio.run(first_render())
+
+
+@pytest.fixture
+def aggregation_calls(dashboard, monkeypatch):
+    # function name -> computations, i.e. aggregation cache misses
+    calls = Counter()
+    get = dashboard.aggregation_cache.get
+
+    def counting_get(key):
+        found, value = get(key)
+        if not found:
+            calls[key[0]] += 1
+        return found, value
+
+    dashboard.aggregation_cache.clear()
+    monkeypatch.setattr(dashboard.aggregation_cache, "get", counting_get)
+    return calls
+
+
+@pytest.mark.parametrize("path", PAGE_AGGREGATIONS)
+def test_navigation_only_computes_the_active_page(dashboard, aggregation_calls, path):
+    render(dashboard, path)
+    assert set(aggregation_calls) == PAGE_AGGREGATIONS[path]
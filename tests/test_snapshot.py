@@ -0,0 +1,76 @@
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import snapshot
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "orders.csv"
+    pd.DataFrame({
+        "State": ["Texas", "Ohio", "Texas", "Utah"],
+        "Category": ["Furniture", "Technology", "Technology", "Furniture"],
+        "Order_Year": [2015, 2015, 2016, 2017],
+        "Sales": [1.5, 2.0, 3.25, 4.0],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.skipif(snapshot.pyarrow is None, reason="snapshots need pyarrow")
+def test_concurrent_starts_build_the_snapshot_once(csv_path):
+    builds = []
+
+    def build(path):
+        builds.append(path)
+        time.sleep(0.2)
+        return pd.read_csv(path)
+
+    results = [None] * 4
+
+    def start(number):
+        results[number] = snapshot.load_snapshot(csv_path, build)
+
+    threads = [threading.Thread(target=start, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert sorted(meta["source"] for _, meta in results) == ["csv", "snapshot", "snapshot", "snapshot"]
+    expected = pd.read_csv(csv_path)
+    for store, _ in results:
+        rows = store.rows({})
+        pd.testing.assert_frame_equal(rows.sort_index(), expected, check_dtype=False)
+
+    # nothing but the snapshot, its meta and the lock is left behind
+    _, meta_path = snapshot.snapshot_paths(csv_path)
+    assert sorted(path.name for path in Path(meta_path).parent.iterdir()) == [
+        "orders", "orders.json", "orders.json.lock"]
+
+
+@pytest.mark.skipif(snapshot.pyarrow is None, reason="snapshots need pyarrow")
+def test_warm_start_keeps_the_frame_attrs(csv_path):
+    def build(path):
+        the_df = pd.read_csv(path)
+        the_df.attrs["schema_report"] = {"before": 200, "after": 100}
+        return the_df
+
+    _, built = snapshot.load_snapshot(csv_path, build)
+    _, opened = snapshot.load_snapshot(csv_path, build)
+    assert (built["source"], opened["source"]) == ("csv", "snapshot")
+    assert opened["attrs"] == built["attrs"] == {"schema_report": {"before": 200, "after": 100}}
+
+
+def test_unwritable_snapshot_directory_keeps_the_rows_in_memory(csv_path, tmp_path):
+    # a snapshot directory that cannot be created
+    (tmp_path / "read-only").write_text("")
+    store, meta = snapshot.load_snapshot(csv_path, pd.read_csv,
+                                         snapshot_dir=str(tmp_path / "read-only" / "snapshot"))
+    assert meta["source"] == "csv"
+    assert all("frame" in partition for partition in store.partitions)
+    pd.testing.assert_frame_equal(store.rows({}).sort_index(), pd.read_csv(csv_path))
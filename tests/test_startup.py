@@ -0,0 +1,30 @@
+import asyncio
+
+from reactpy.core.layout import Layout
+
+from startup import Startup
+
+
+def render(element):
+    async def first_render():
+        async with Layout(element) as layout:
+            return await layout.render()
+
+    return str(asyncio.run(first_render()))
+
+
+def test_failed_dataset_load_is_logged_and_shown(dashboard, monkeypatch, caplog):
+    error = OSError("Sample_Store.csv is unreadable")
+
+    def load_dataset():
+        raise error
+
+    monkeypatch.setattr(dashboard, "startup", Startup(0))
+    monkeypatch.setattr(dashboard, "load_dataset", load_dataset)
+    # the task nobody awaits ends quietly, having logged the failure
+    asyncio.run(dashboard.start_dashboard())
+
+    assert dashboard.startup.error is error
+    assert "Startup failed" in caplog.text and "unreadable" in caplog.text
+    assert "The dashboard data could not be loaded" in render(dashboard.App())
+    assert "This chart could not be computed" in render(dashboard.pending_section(ValueError()))
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+from compute_pool import ComputePool
+from page_scheduler import PageScheduler
+from result_cache import ResultCache
+from warmup import WarmUp
+
+
+def test_inline_pages_hold_off_the_warm_up():
+    scheduler = PageScheduler(ComputePool("inline"), {})
+    order = []
+
+    def warm(the_key):
+        order.append(("warm", the_key))
+
+    def page(the_key):
+        # inline pages block the event loop: start the warm-up meanwhile and
+        # give its worker thread time to run, it has to wait for the page
+        order.append(("page", scheduler.busy))
+        worker = threading.Thread(target=asyncio.run, args=(warm_up.run(),))
+        worker.start()
+        worker.join(0.2)
+        order.append(("page done", worker.is_alive()))
+        return worker
+
+    scheduler.pages = {"home": {"page": page}}
+    warm_up = WarmUp([warm], [("All", "All", "All")], delay=0.01,
+                     busy=lambda: scheduler.busy)
+    worker = scheduler.run_sync("home", ("All", "All", "All"))["page"]
+    worker.join(5)
+
+    assert not scheduler.busy
+    assert order == [("page", True), ("page done", True), ("warm", ("All", "All", "All"))]
+
+
+def test_warm_up_stops_at_what_the_cache_holds():
+    cache = ResultCache(maxsize=10)
+
+    @cache.memoize
+    def totals(the_key, measure):
+        return the_key, measure
+
+    def page(the_key):
+        # three cache entries per key
+        return [totals(the_key, measure) for measure in ("Sales", "Profit", "Quantity")]
+
+    keys = [(state, "All", "All") for state in ("All", "Texas", "Ohio", "Utah", "Iowa")]
+    warm_up = WarmUp([page], keys, delay=0, caches=[cache])
+    asyncio.run(warm_up.run())
+
+    assert warm_up.progress()["limit"] == 3
+    assert warm_up.done == warm_up.total == 3
+    assert cache.stats()["evictions"] == 0
+    assert [cache.entries_for(the_key) for the_key in keys] == [3, 3, 3, 0, 0]
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("dashboard.warmup")
+
+
+def prioritized_keys(state_list, years_list, category_list, state_rows):
+    """Every (state, year, category) filter key, most requested first.
+
+    Broad views come before narrow ones (fewer non-"All" filters first), and
+    within the same breadth the states with the most rows come first.
+    """
+    keys = [(state, str(year), category)
+            for state in state_list
+            for year in years_list
+            for category in category_list]
+
+    def priority(the_key):
+        specific = sum(value != "All" for value in the_key)
+        return specific, -state_rows.get(the_key[0], 0)
+
+    return sorted(keys, key=priority)
+
+
+class WarmUp:
+    """Precomputes ``functions`` for every filter key in the background.
+
+    Keys are warmed in order, but only as many as the result ``caches`` hold:
+    once the first key is done, what it added to each cache sets ``limit``,
+    so later keys never evict the (more requested) earlier ones.
+
+    Runs on a single worker thread and sleeps ``delay`` seconds between
+    computations; while ``busy()`` is true (live page computations in flight)
+    it waits, so it never competes with real sessions for long. The worker
+    thread checks too: inline page computations block the event loop, so
+    only another thread sees them running.
+    """
+
+    def __init__(self, functions, keys, delay=0.05, busy=None, caches=()):
+        self.functions = functions
+        self.keys = keys
+        self.caches = caches
+        self.limit = None
+        self.delay = delay
+        self.busy = busy or (lambda: False)
+        self.done = 0
+        self.failed = 0
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def total(self):
+        keys = len(self.keys) if self.limit is None else min(self.limit, len(self.keys))
+        return len(self.functions) * keys
+
+    def fitting_keys(self, the_key):
+        # as many keys as every cache holds, judging by what the_key took
+        limit = len(self.keys)
+        for cache in self.caches:
+            entries = cache.entries_for(the_key)
+            if entries:
+                limit = min(limit, cache.maxsize // entries)
+        return max(1, limit)
+
+    def progress(self):
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.monotonic()) - self.started_at, 2)
+        return {
+            "done": self.done,
+            "failed": self.failed,
+            "total": self.total,
+            "keys": len(self.keys),
+            "limit": self.limit,
+            "percent": round(100 * self.done / self.total, 1) if self.total else 100.0,
+            "running": self.started_at is not None and self.finished_at is None,
+            "elapsed": elapsed,
+        }
+
+    def compute(self, function, the_key):
+        while self.busy():
+            time.sleep(self.delay or 0.05)
+        return function(the_key)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self.started_at = time.monotonic()
+        logger.info("Warm-up started: %s computations", self.total)
+        step = max(1, self.total // 20)
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="dashboard-warmup") as executor:
+            for number, the_key in enumerate(self.keys):
+                if self.limit is not None and number >= self.limit:
+                    break
+                for function in self.functions:
+                    while self.busy():
+                        await asyncio.sleep(self.delay or 0.05)
+                    try:
+                        await loop.run_in_executor(executor, self.compute, function, the_key)
+                    except Exception:
+                        self.failed += 1
+                        logger.exception("Warm-up of %r for %s failed",
+                                         function, the_key)
+                    self.done += 1
+                    if self.done % step == 0:
+                        logger.info("Warm-up %s/%s", self.done, self.total)
+                    await asyncio.sleep(self.delay)
+                if number == 0:
+                    self.limit = self.fitting_keys(the_key)
+                    if self.limit < len(self.keys):
+                        logger.info("Warm-up limited to %s of %s keys, as many as the caches hold",
+                                    self.limit, len(self.keys))
+                    step = max(1, self.total // 20)
+
+        self.finished_at = time.monotonic()
+        logger.info("Warm-up finished in %.1fs", self.finished_at - self.started_at)